@@ -1,7 +1,180 @@
+import hashlib
+from datetime import datetime
+
 from django.contrib import admin
+from django.contrib.admin.options import IncorrectLookupParameters, ShowFacets
+from django.contrib.admin.views.main import ORDER_VAR, ChangeList
+from django.core import signing
+from django.core.cache import cache
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import Q
+from django.utils.functional import cached_property
 from .models import MyModel, MyProduct
+from .search import fts_query, search_filter, search_index_exists
+
+# Filtered changelist counts stop at this many rows and are cached for this many seconds
+ADMIN_COUNT_LIMIT = 10000
+ADMIN_COUNT_CACHE_TIMEOUT = 60
+CURSOR_VAR = 'after'
+CURSOR_SALT = 'myapp.admin.keyset'
+
+
+# region counts
+def estimate_row_count(model, using):
+    """
+    Rows in the model's table estimated from its primary key range: two index lookups instead of a COUNT(*) over
+    the whole table. Rows deleted from the middle of the range are still counted. None when not on SQLite.
+    """
+    connection = connections[using]
+    if connection.vendor != 'sqlite':
+        return None
+    table = connection.ops.quote_name(model._meta.db_table)
+    pk = connection.ops.quote_name(model._meta.pk.column)
+    # Separate subqueries: SQLite only answers MIN()/MAX() from the index when each is alone in its SELECT
+    with connection.cursor() as cursor:
+        cursor.execute(f'SELECT (SELECT MAX({pk}) FROM {table}) - (SELECT MIN({pk}) FROM {table}) + 1')
+        estimate = cursor.fetchone()[0]
+    return estimate or 0
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator that never counts a whole table: unfiltered lists use estimate_row_count(), filtered ones (search,
+    date hierarchy) count at most ADMIN_COUNT_LIMIT rows and cache the result for a minute.
+    `is_estimate` tells the template to show the count as approximate.
+    """
+
+    is_estimate = False
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        if not queryset.query.where:
+            estimate = estimate_row_count(queryset.model, queryset.db)
+            if estimate is not None:
+                self.is_estimate = True
+                return estimate
+
+        sql, params = queryset.query.sql_with_params()
+        digest = hashlib.md5(repr((queryset.db, sql, params)).encode()).hexdigest()
+        key = f'myapp:admin:count:{queryset.model._meta.label_lower}:{digest}'
+        count = cache.get(key)
+        if count is None:
+            count = queryset.order_by()[:ADMIN_COUNT_LIMIT].count()
+            cache.set(key, count, ADMIN_COUNT_CACHE_TIMEOUT)
+        self.is_estimate = count >= ADMIN_COUNT_LIMIT
+        return count
+# endregion
+
+
+# region keyset navigation
+def keyset_after(fields, values):
+    """
+    Rows after the `values` key in descending `fields` order, the last field being the primary key.
+    Written as `f <= x AND (f < x OR pk < y)` so SQLite seeks into the (f, pk) index instead of walking it from
+    the top: every "Next" page costs the same, however deep. Rows with a NULL `f` sort last and are only
+    reachable through the numbered pages.
+    """
+    if len(fields) == 1:
+        return Q(pk__lt=values[0])
+    (field, _), (value, pk) = fields, values
+    if value is None:
+        return Q(**{f'{field}__isnull': True}, pk__lt=pk)
+    return Q(**{f'{field}__lte': value}) & (Q(**{f'{field}__lt': value}) | Q(pk__lt=pk))
+
+
+class KeysetChangeList(ChangeList):
+    """
+    ChangeList with a "Next" link that continues after the last row shown (`?after=<signed key>`) instead of
+    jumping to an OFFSET. Only used with the admin's default ordering, the numbered pages still work for every
+    ordering.
+    """
+
+    def __init__(self, request, *args, **kwargs):
+        self.keyset_after = None
+        cursor = request.GET.get(CURSOR_VAR)
+        if cursor:
+            try:
+                self.keyset_after = signing.loads(cursor, salt=CURSOR_SALT)
+            except signing.BadSignature:
+                raise IncorrectLookupParameters
+        super().__init__(request, *args, **kwargs)
+
+    @property
+    def keyset_fields(self):
+        return self.model_admin.keyset_fields
+
+    def get_queryset(self, request, exclude_parameters=None):
+        # `after` isn't a field lookup: keep it out of the filters and out of the links the changelist builds
+        self.params.pop(CURSOR_VAR, None)
+        self.filter_params.pop(CURSOR_VAR, None)
+        queryset = super().get_queryset(request, exclude_parameters)
+        if self.keyset_active:
+            queryset = queryset.filter(keyset_after(self.keyset_fields, self.keyset_after))
+        return queryset
+
+    @property
+    def keyset_active(self):
+        return self.keyset_after is not None and ORDER_VAR not in self.params
+
+    def get_results(self, request):
+        if self.keyset_active:
+            self.page_num = 1
+        super().get_results(request)
+        self.keyset_first_url = self.get_query_string() if self.keyset_active else None
+        self.keyset_next_url = None
+        if ORDER_VAR not in self.params and self.multi_page and not self.show_all:
+            rows = list(self.result_list)
+            if len(rows) == self.list_per_page:
+                last = rows[-1]
+                # Dates go in the key as full ISO strings (the lookups parse them back), microseconds included
+                key = [value.isoformat() if isinstance(value, datetime) else value
+                       for value in (getattr(last, field) for field in self.keyset_fields)]
+                cursor = signing.dumps(key, salt=CURSOR_SALT)
+                self.keyset_next_url = self.get_query_string({CURSOR_VAR: cursor})
+# endregion
+
+
+class LargeTableAdmin(admin.ModelAdmin):
+    """
+    ModelAdmin for tables with millions of rows: no full COUNT(*), keyset "Next" links and sorting only on
+    indexed columns. Subclasses set `keyset_fields` (their index, primary key last) and list only indexed
+    columns in `list_display`.
+    """
+
+    keyset_fields = ('id',)
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    show_facets = ShowFacets.NEVER
+
+    def get_ordering(self, request):
+        return tuple(f'-{field}' for field in self.keyset_fields)
+
+    def get_sortable_by(self, request):
+        return self.get_list_display(request)
+
+    def get_changelist(self, request, **kwargs):
+        return KeysetChangeList
+
+
+@admin.register(MyModel)
+class MyModelAdmin(LargeTableAdmin):
+    keyset_fields = ('created_at', 'id')  # myapp_mymodel_created_id_idx
+    list_display = ('id', 'name', 'created_at')
+    date_hierarchy = 'created_at'
+    # Answered by the FTS5 index, see get_search_results(). Only the newest FTS_RANK_CANDIDATES matches are
+    # listed, like in the search API
+    search_fields = ('name', 'description')
+
+    def get_search_results(self, request, queryset, search_term):
+        if not search_term or not search_index_exists(connections[queryset.db]):
+            return super().get_search_results(request, queryset, search_term)
+        if fts_query(search_term) is None:
+            return queryset.none(), False
+        return queryset.filter(id__in=search_filter(search_term)), False
 
-# Register your models here.
 
-admin.site.register(MyModel)
-admin.site.register(MyProduct)
\ No newline at end of file
+@admin.register(MyProduct)
+class MyProductAdmin(LargeTableAdmin):
+    list_display = ('id', 'unique_code', 'slug')
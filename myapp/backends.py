@@ -0,0 +1,91 @@
+import inspect
+from concurrent.futures import ThreadPoolExecutor
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth import get_user_model, load_backend
+from django.contrib.auth.backends import ModelBackend
+from django.contrib.auth.hashers import verify_password
+from django.contrib.auth.signals import user_login_failed
+from django.core.exceptions import PermissionDenied
+
+# Password hashing is CPU bound and hashlib releases the GIL while it runs, so a handful of threads verify
+# passwords in parallel. The pool is bounded so a login burst queues up instead of starting a thread per request.
+password_executor = ThreadPoolExecutor(
+    max_workers=getattr(settings, 'PASSWORD_HASHING_WORKERS', None),
+    thread_name_prefix='password-hashing',
+)
+
+
+async def run_in_password_executor(func, *args):
+    return await sync_to_async(func, thread_sensitive=False, executor=password_executor)(*args)
+
+
+class ExecutorModelBackend(ModelBackend):
+    """
+    ModelBackend with a native aauthenticate(). The user lookup still goes through the ORM's thread, but the
+    password is verified in `password_executor` rather than on the single thread that every
+    sync_to_async(thread_sensitive=True) call shares.
+    """
+
+    async def aauthenticate(self, request, username=None, password=None, **kwargs):
+        UserModel = get_user_model()
+        if username is None:
+            username = kwargs.get(UserModel.USERNAME_FIELD)
+        if username is None or password is None:
+            return
+        try:
+            user = await sync_to_async(UserModel._default_manager.get_by_natural_key)(username)
+        except UserModel.DoesNotExist:
+            # Run the default password hasher once to reduce the timing
+            # difference between an existing and a nonexistent user (#20760).
+            await run_in_password_executor(UserModel().set_password, password)
+            return
+
+        is_correct, must_update = await run_in_password_executor(verify_password, password, user.password)
+        if is_correct and must_update:
+            # Same hash upgrade as AbstractBaseUser.check_password()
+            await run_in_password_executor(user.set_password, password)
+            user._password = None
+            await user.asave(update_fields=['password'])
+        if is_correct and self.user_can_authenticate(user):
+            return user
+
+
+async def aauthenticate(request=None, **credentials):
+    """
+    Async counterpart of django.contrib.auth.authenticate().
+    django.contrib.auth.aauthenticate() in Django 5.1 runs the whole sync authenticate() through
+    sync_to_async, so every login is serialized on one thread. This one awaits the backends' own
+    aauthenticate() when they have one.
+    """
+    tried = []
+    for backend_path in settings.AUTHENTICATION_BACKENDS:
+        backend = load_backend(backend_path)
+        if any(isinstance(other, type(backend)) for other in tried):
+            # A subclass already checked these credentials (ModelBackend after ExecutorModelBackend), don't
+            # hash a wrong password twice
+            continue
+        tried.append(backend)
+        authenticate = getattr(backend, 'aauthenticate', None)
+        if authenticate is None:
+            authenticate = sync_to_async(backend.authenticate)
+        try:
+            inspect.signature(backend.authenticate).bind(request, **credentials)
+        except TypeError:
+            # This backend doesn't accept these credentials as arguments. Try the next one.
+            continue
+        try:
+            user = await authenticate(request, **credentials)
+        except PermissionDenied:
+            # This backend says to stop in our tracks - this user should not be allowed in at all.
+            break
+        if user is None:
+            continue
+        # Annotate the user object with the path of the backend.
+        user.backend = backend_path
+        return user
+
+    # The credentials supplied are invalid to all backends, fire signal
+    credentials = {key: '********************' if key == 'password' else value for key, value in credentials.items()}
+    await user_login_failed.asend(sender=__name__, credentials=credentials, request=request)
@@ -0,0 +1,37 @@
+from itertools import islice
+
+from asgiref.sync import sync_to_async
+from django.core.serializers.json import DjangoJSONEncoder
+from .models import MyModel, MyProduct
+
+# Exported models by name, with the columns that end up in every NDJSON line
+EXPORT_MODELS = {
+    'mymodels': (MyModel, ('id', 'name', 'description', 'created_at', 'updated_at')),
+    'myproducts': (MyProduct, ('id', 'name', 'unique_code', 'slug')),
+}
+EXPORT_CHUNK_SIZE = 2000
+
+
+def iter_ndjson(model_name, chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    Yield the whole table as NDJSON lines, one row per line.
+    values_list().iterator() fetches `chunk_size` rows at a time and skips the queryset cache,
+    so memory stays flat whatever the table size.
+    """
+    model, fields = EXPORT_MODELS[model_name]
+    encoder = DjangoJSONEncoder()
+    rows = model.objects.order_by('pk').values_list(*fields).iterator(chunk_size=chunk_size)
+    for row in rows:
+        yield encoder.encode(dict(zip(fields, row))) + '\n'
+
+
+async def aiter_ndjson(model_name, chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    iter_ndjson() for ASGI, which buffers a sync iterator into a list before streaming it. The sync generator
+    is advanced `chunk_size` lines at a time in a worker thread (the rows are read there too) and every chunk
+    is yielded as one string, so memory stays flat here as well.
+    """
+    lines = iter_ndjson(model_name, chunk_size)
+    next_chunk = sync_to_async(lambda: ''.join(islice(lines, chunk_size)))
+    while chunk := await next_chunk():
+        yield chunk
@@ -0,0 +1,52 @@
+import atexit
+import json
+import logging
+from logging.handlers import QueueHandler, QueueListener
+from queue import SimpleQueue
+
+# Attributes every LogRecord has, anything else on a record came in through `extra=`
+_RECORD_ATTRIBUTES = set(vars(logging.makeLogRecord({}))) | {'message', 'asctime', 'taskName'}
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    One JSON object per line with the standard fields plus whatever was passed in `extra=`.
+    """
+
+    def format(self, record):
+        data = {
+            'time': self.formatTime(record),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        data.update({key: value for key, value in vars(record).items() if key not in _RECORD_ATTRIBUTES})
+        if record.exc_info:
+            data['exc_info'] = self.formatException(record.exc_info)
+        return json.dumps(data, default=str)
+
+
+class QueueStreamHandler(QueueHandler):
+    """
+    Logging calls only put the record on a queue; a QueueListener thread formats it and writes it to
+    the stream, so request handling never waits on stdout/stderr. The formatter configured for this
+    handler is used by the listener.
+    """
+
+    def __init__(self, stream=None):
+        super().__init__(SimpleQueue())
+        self.target = logging.StreamHandler(stream)
+        self.listener = QueueListener(self.queue, self.target, respect_handler_level=True)
+        self.listener.start()
+        atexit.register(self.listener.stop)
+
+    def setFormatter(self, fmt):
+        self.target.setFormatter(fmt)
+
+    def prepare(self, record):
+        # Keep the record as is (QueueHandler would pre-format it in the caller's thread),
+        # only resolve the message so args don't need to be picklable or thread safe
+        record = logging.makeLogRecord(vars(record))
+        record.msg = record.getMessage()
+        record.args = None
+        return record
@@ -0,0 +1,84 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections, transaction
+from django.db.models import Max, Min
+from django.utils import timezone
+from myapp.models import ArchiveCheckpoint, MyModel, MyModelArchive
+from myapp.routers import PRIMARY
+from datetime import timedelta
+import time
+
+ARCHIVED_FIELDS = ('id', 'name', 'description', 'created_at', 'updated_at')
+
+
+class Command(BaseCommand):
+    help = ('This command will move MyModel objects older than --older-than days into the MyModelArchive table, '
+            'in small id-range batches that can be resumed')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--older-than', type=int, required=True,
+                            help='Archive objects created more than this many days ago')
+        parser.add_argument('--batch-size', type=int, default=1000,
+                            help='Width of the id range moved per transaction')
+        parser.add_argument('--database', default=PRIMARY,
+                            help='Database holding the archive table: the primary (default) or e.g. "archive", '
+                                 'a separate SQLite file')
+        parser.add_argument('--sleep', type=float, default=0.0,
+                            help='Seconds to wait between batches so other writers can get the SQLite lock')
+        parser.add_argument('--restart', action='store_true',
+                            help='Ignore the checkpoint of an unfinished run and start a new one')
+
+    def handle(self, *args, **options):
+        batch_size, database = options['batch_size'], options['database']
+        if options['older_than'] < 0 or batch_size < 1:
+            raise CommandError('--older-than must not be negative and --batch-size must be a positive number')
+        if database not in connections.settings:
+            raise CommandError(f'Unknown database {database!r}')
+
+        checkpoint = self.get_checkpoint(database, options['older_than'], options['restart'])
+        cutoff, max_id = checkpoint.cutoff, checkpoint.max_id
+
+        moved = batches = 0
+        start = time.perf_counter()
+        while checkpoint.last_id < max_id:
+            low, high = checkpoint.last_id, min(checkpoint.last_id + batch_size, max_id)
+            # One short write transaction per batch. When the archive is another file its rows are committed
+            # first: a crash in between leaves copies that the resumed run skips (ignore_conflicts), never losses.
+            with transaction.atomic(using=PRIMARY):
+                batch = MyModel.objects.using(PRIMARY).filter(id__gt=low, id__lte=high, created_at__lt=cutoff)
+                rows = list(batch.values(*ARCHIVED_FIELDS))
+                if rows:
+                    with transaction.atomic(using=database):
+                        MyModelArchive.objects.using(database).bulk_create(
+                            [MyModelArchive(**row) for row in rows], ignore_conflicts=True
+                        )
+                    batch.delete()
+                checkpoint.last_id = high
+                checkpoint.save(update_fields=['last_id', 'updated_at'])
+            moved += len(rows)
+            batches += 1
+            if options['sleep']:
+                time.sleep(options['sleep'])
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Archived {moved} MyModel objects created before {cutoff:%Y-%m-%d %H:%M} into {database} '
+            f'in {batches} batches ({time.perf_counter() - start:.2f}s)'
+        ))
+
+    def get_checkpoint(self, database, older_than, restart):
+        name = f'mymodels:{database}'
+        checkpoint = ArchiveCheckpoint.objects.using(PRIMARY).filter(name=name).first()
+        if checkpoint is not None and checkpoint.last_id < checkpoint.max_id and not restart:
+            # The previous run was interrupted: finish it with its own cutoff
+            self.stdout.write(f'Resuming the run for rows created before {checkpoint.cutoff:%Y-%m-%d %H:%M} '
+                              f'after id {checkpoint.last_id}')
+            return checkpoint
+
+        cutoff = timezone.now() - timedelta(days=older_than)
+        # Rows with a NULL created_at are never archived. The run starts at MIN(id): older ids are already gone.
+        max_id = MyModel.objects.using(PRIMARY).filter(created_at__lt=cutoff).aggregate(max_id=Max('id'))['max_id']
+        min_id = MyModel.objects.using(PRIMARY).aggregate(min_id=Min('id'))['min_id']
+        checkpoint, _ = ArchiveCheckpoint.objects.using(PRIMARY).update_or_create(
+            name=name,
+            defaults={'cutoff': cutoff, 'last_id': (min_id or 1) - 1, 'max_id': max_id or 0},
+        )
+        return checkpoint
@@ -0,0 +1,328 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.contrib.auth.models import User
+from django.db import connection, connections
+from django.test import Client
+from django.test.utils import override_settings, setup_test_environment, teardown_test_environment
+from django.urls import reverse
+from myapp.models import MyModel, MyProduct
+from myapp.sqlite import apply_pragmas, get_pragmas
+from concurrent.futures import ThreadPoolExecutor
+import itertools
+import json
+import math
+import os
+import sqlite3
+import statistics
+import tempfile
+import time
+
+
+def percentile(sorted_values, percent):
+    # Nearest-rank percentile of an already sorted list
+    rank = max(1, math.ceil(percent / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def summarize(latencies):
+    latencies = sorted(latencies)
+    total = sum(latencies)
+    return {
+        'ops': len(latencies),
+        'ops_per_sec': round(len(latencies) / total, 2) if total > 0 else None,
+        'p50_ms': round(percentile(latencies, 50) * 1000, 3),
+        'p95_ms': round(percentile(latencies, 95) * 1000, 3),
+        'p99_ms': round(percentile(latencies, 99) * 1000, 3),
+        'max_ms': round(latencies[-1] * 1000, 3),
+    }
+
+
+def median_run(runs):
+    # Every statistic is the median over the repeated runs of a benchmark, so one noisy run does not move it
+    merged = {}
+    for key, value in runs[0].items():
+        if isinstance(value, dict):
+            merged[key] = median_run([run[key] for run in runs])
+        elif value is not None:
+            merged[key] = round(statistics.median(run[key] for run in runs), 3)
+        else:
+            merged[key] = value
+    return merged
+
+
+def p50_latencies(results):
+    # {benchmark: p50_ms}, the sqlite load tests report their reads and writes separately
+    latencies = {}
+    for name, result in results.items():
+        if 'p50_ms' in result:
+            latencies[name] = result['p50_ms']
+        for kind, summary in result.items():
+            if isinstance(summary, dict) and 'p50_ms' in summary:
+                latencies[f'{name}.{kind}'] = summary['p50_ms']
+    return latencies
+
+
+class Command(BaseCommand):
+    help = ('This command will benchmark the views (through the test Client) and the MyModel/MyProduct write paths '
+            'on a throwaway test database and print the results as JSON')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=50,
+                            help='Number of timed operations per benchmark run')
+        parser.add_argument('--warmup', type=int, default=5,
+                            help='Untimed operations before each benchmark')
+        parser.add_argument('--repeat', type=int, default=5,
+                            help='Runs per benchmark, the results are the median of the runs')
+        parser.add_argument('--only', choices=['views', 'orm', 'sqlite'], default=None,
+                            help='Run only one group of benchmarks')
+        parser.add_argument('--readers', type=int, default=4,
+                            help='sqlite: number of reader threads')
+        parser.add_argument('--writers', type=int, default=2,
+                            help='sqlite: number of writer threads')
+        parser.add_argument('--output', default=None,
+                            help='Also write the JSON results to this file (e.g. to save a new baseline)')
+        parser.add_argument('--baseline', default=None,
+                            help='JSON file from an earlier run to compare against')
+        parser.add_argument('--tolerance', type=float, default=0.5,
+                            help='Allowed p50 latency increase against the baseline before it counts as a regression')
+
+    def handle(self, *args, **options):
+        iterations = options['iterations']
+        if iterations < 1 or options['repeat'] < 1:
+            raise CommandError('--iterations and --repeat must be positive numbers')
+        if options['warmup'] < 0:
+            raise CommandError('--warmup must not be negative')
+        self.warmup = options['warmup']
+        self.repeat = options['repeat']
+        if options['readers'] < 0 or options['writers'] < 0 or options['readers'] + options['writers'] < 1:
+            raise CommandError('--readers and --writers must not be negative and at least one must be positive')
+        baseline = None
+        if options['baseline']:
+            try:
+                with open(options['baseline'], encoding='utf-8') as file:
+                    baseline = json.load(file)
+            except (OSError, ValueError) as e:
+                raise CommandError(f'Cannot read baseline {options["baseline"]}: {e}')
+
+        # Never benchmark against the real database: build the test database like manage.py test does.
+        # DEBUG and QueryCountMiddleware are off so the timings don't include their query logging.
+        setup_test_environment(debug=False)
+        production_like = override_settings(QUERY_COUNT_MIDDLEWARE=False)
+        production_like.enable()
+        old_name = connection.settings_dict['NAME']
+        connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        # Point the test mirrors (the replica) at it too, like the test runner, instead of the real replica
+        mirrors = {alias: connections[alias].settings_dict['NAME'] for alias in connections
+                   if connections[alias].settings_dict['TEST']['MIRROR'] == connection.alias}
+        for alias in mirrors:
+            connections[alias].close()
+            connections[alias].creation.set_as_test_mirror(connection.settings_dict)
+        try:
+            results = {}
+            if options['only'] in (None, 'views'):
+                results.update(self.bench_views(iterations))
+            if options['only'] in (None, 'orm'):
+                results.update(self.bench_orm(iterations))
+            if options['only'] in (None, 'sqlite'):
+                results.update(self.bench_sqlite(iterations, options['readers'], options['writers']))
+        finally:
+            for alias, name in mirrors.items():
+                connections[alias].close()
+                connections[alias].settings_dict['NAME'] = name
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            production_like.disable()
+            teardown_test_environment()
+
+        output = json.dumps(results, indent=2)
+        self.stdout.write(output)
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as file:
+                file.write(output + '\n')
+
+        if baseline is not None:
+            self.compare(results, baseline, options['tolerance'])
+
+    warmup = 5
+    repeat = 5
+
+    def timed(self, iterations, operation, prepare=None):
+        # `i` keeps counting through the warm-up and the runs, so operations that create rows never repeat a name
+        counter = iter(range(self.warmup + self.repeat * iterations))
+        for i in itertools.islice(counter, self.warmup):
+            operation(i, *(prepare(i) if prepare else ()))
+        runs = []
+        for run in range(self.repeat):
+            latencies = []
+            for i in itertools.islice(counter, iterations):
+                args = prepare(i) if prepare else ()
+                start = time.perf_counter()
+                operation(i, *args)
+                latencies.append(time.perf_counter() - start)
+            runs.append(summarize(latencies))
+        return median_run(runs)
+
+    # region views
+    def bench_views(self, iterations):
+        User.objects.create_user(username='bench', password='bench')
+        anonymous = Client()
+        credentials = {'username': 'bench', 'password': 'bench'}
+
+        def logged_in_client(i):
+            client = Client()
+            client.force_login(User.objects.get(username='bench'))
+            return (client,)
+
+        def get(url, client=anonymous, status=200):
+            def operation(i, *args):
+                response = (args[0] if args else client).get(url)
+                assert response.status_code == status, f'{url} returned {response.status_code}'
+            return operation
+
+        def login_post(i):
+            response = Client().post(reverse('login'), credentials)
+            assert response.status_code == 302, f'login returned {response.status_code}'
+
+        return {
+            'view.home': self.timed(iterations, get(reverse('home'))),
+            'view.login.get': self.timed(iterations, get(reverse('login'))),
+            'view.login.post': self.timed(iterations, login_post),
+            'view.logout': self.timed(iterations, get(reverse('logout'), status=302), prepare=logged_in_client),
+        }
+    # endregion
+
+    # region orm
+    def bench_orm(self, iterations):
+        models = []
+        products = []
+
+        def insert_mymodel(i):
+            models.append(MyModel.objects.create(name=f'Bench object {i}', description='benchmark'))
+
+        def insert_myproduct(i):
+            products.append(MyProduct.objects.create(name=f'Bench product {i}', unique_code=f'BENCH{i}'))
+
+        def update_mymodel(i):
+            obj = models[i % len(models)]
+            obj.description = f'updated {i}'
+            obj.save(update_fields=['description', 'updated_at'])
+
+        def update_myproduct(i):
+            MyProduct.objects.filter(pk=products[i % len(products)].pk).update(name=f'Updated product {i}')
+
+        def lookup_mymodel(i):
+            MyModel.objects.get(pk=models[i % len(models)].pk)
+
+        def lookup_myproduct_slug(i):
+            MyProduct.objects.get(slug=products[i % len(products)].slug)
+
+        def lookup_myproduct_code(i):
+            MyProduct.objects.get(unique_code=products[i % len(products)].unique_code)
+
+        return {
+            'orm.mymodel.insert': self.timed(iterations, insert_mymodel),
+            'orm.myproduct.insert': self.timed(iterations, insert_myproduct),
+            'orm.mymodel.update': self.timed(iterations, update_mymodel),
+            'orm.myproduct.update': self.timed(iterations, update_myproduct),
+            'orm.mymodel.lookup_pk': self.timed(iterations, lookup_mymodel),
+            'orm.myproduct.lookup_slug': self.timed(iterations, lookup_myproduct_slug),
+            'orm.myproduct.lookup_unique_code': self.timed(iterations, lookup_myproduct_code),
+        }
+    # endregion
+
+    # region sqlite
+    def bench_sqlite(self, iterations, readers, writers):
+        # The test database is in memory, so concurrency is measured on a scratch file with plain sqlite3
+        # connections: once with SQLite's defaults and once with settings.SQLITE_PRAGMAS
+        return {
+            'sqlite.concurrent.defaults': median_run(
+                [self.concurrent_load(iterations, readers, writers, {}) for run in range(self.repeat)]),
+            'sqlite.concurrent.pragmas': median_run(
+                [self.concurrent_load(iterations, readers, writers, get_pragmas()) for run in range(self.repeat)]),
+        }
+
+    def concurrent_load(self, iterations, readers, writers, pragmas):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'bench.sqlite3')
+
+            def connect():
+                # Autocommit, like Django: transactions are started explicitly below
+                conn = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+                apply_pragmas(conn.cursor(), pragmas)
+                return conn
+
+            conn = connect()
+            conn.execute('CREATE TABLE bench (id INTEGER PRIMARY KEY, name TEXT, payload TEXT)')
+            conn.executemany('INSERT INTO bench (name, payload) VALUES (?, ?)',
+                             [(f'row {i}', 'x' * 200) for i in range(1000)])
+            conn.close()
+
+            def write(worker):
+                conn = connect()
+                latencies, errors = [], 0
+                for i in range(iterations):
+                    start = time.perf_counter()
+                    try:
+                        conn.execute('BEGIN IMMEDIATE')
+                        conn.execute('INSERT INTO bench (name, payload) VALUES (?, ?)', (f'writer {worker} {i}', 'y' * 200))
+                        conn.execute('COMMIT')
+                    except sqlite3.OperationalError:
+                        errors += 1
+                        if conn.in_transaction:
+                            conn.execute('ROLLBACK')
+                    latencies.append(time.perf_counter() - start)
+                conn.close()
+                return 'write', latencies, errors
+
+            def read(worker):
+                conn = connect()
+                latencies, errors = [], 0
+                for i in range(iterations):
+                    start = time.perf_counter()
+                    try:
+                        low = (worker * iterations + i) * 7 % 900
+                        conn.execute('SELECT name, payload FROM bench WHERE id BETWEEN ? AND ?', (low, low + 100)).fetchall()
+                    except sqlite3.OperationalError:
+                        errors += 1
+                    latencies.append(time.perf_counter() - start)
+                conn.close()
+                return 'read', latencies, errors
+
+            start = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=readers + writers) as executor:
+                futures = [executor.submit(write, i) for i in range(writers)]
+                futures += [executor.submit(read, i) for i in range(readers)]
+                outcomes = [future.result() for future in futures]
+            elapsed = time.perf_counter() - start
+
+        result = {}
+        for kind in ('read', 'write'):
+            latencies = [latency for k, values, _ in outcomes if k == kind for latency in values]
+            if latencies:
+                summary = summarize(latencies)
+                # Throughput of all threads together, not the per-operation rate summarize() reports
+                summary['ops_per_sec'] = round(len(latencies) / elapsed, 2)
+                summary['errors'] = sum(errors for k, _, errors in outcomes if k == kind)
+                result[kind] = summary
+        result['ops'] = sum(len(values) for _, values, _ in outcomes)
+        result['ops_per_sec'] = round(result['ops'] / elapsed, 2)
+        return result
+    # endregion
+
+    def compare(self, results, baseline, tolerance):
+        # Gate on the median latency: ops/sec is the mean, which a few slow outliers drag down
+        regressions = []
+        before_latencies = p50_latencies(baseline)
+        for name, after in p50_latencies(results).items():
+            before = before_latencies.get(name)
+            if not before:
+                continue
+            change = (after - before) / before
+            line = f'{name}: {before} -> {after} ms p50 ({change:+.1%})'
+            if change > tolerance:
+                regressions.append(line)
+                self.stderr.write(self.style.ERROR(line))
+            else:
+                self.stderr.write(line)
+
+        if regressions:
+            raise CommandError(f'{len(regressions)} benchmark(s) regressed by more than {tolerance:.0%} against the baseline')
+        self.stderr.write(self.style.SUCCESS('No regressions against the baseline'))
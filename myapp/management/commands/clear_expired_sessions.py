@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.contrib.sessions.models import Session
+from django.db import transaction
+from django.utils import timezone
+import time
+
+
+class Command(BaseCommand):
+    help = 'This command will delete expired sessions in small batches (clearsessions runs one big DELETE)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000,
+                            help='Number of sessions deleted per transaction')
+        parser.add_argument('--sleep', type=float, default=0.0,
+                            help='Seconds to wait between batches so other writers can get the SQLite lock')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        if batch_size < 1:
+            raise CommandError('--batch-size must be a positive number')
+
+        now = timezone.now()
+        expired = Session.objects.filter(expire_date__lt=now)  # expire_date is indexed
+        deleted = 0
+        while True:
+            # Each batch is its own short write transaction instead of holding the lock for the whole table
+            with transaction.atomic():
+                keys = list(expired.values_list('session_key', flat=True)[:batch_size])
+                if not keys:
+                    break
+                Session.objects.filter(session_key__in=keys).delete()
+            deleted += len(keys)
+            if options['sleep']:
+                time.sleep(options['sleep'])
+
+        self.stdout.write(self.style.SUCCESS(f'Deleted {deleted} expired sessions'))
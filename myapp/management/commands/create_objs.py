@@ -1,13 +1,24 @@
-from django.core.management.base import BaseCommand
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
 from myapp.models import MyModel
 from django.utils import timezone
+from itertools import islice
 import time
 
 
 class Command(BaseCommand):
-    help = 'This command will create 10 MyModel objects'
+    help = 'This command will create 10 MyModel objects (or --count objects in bulk mode)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--count', type=int, default=None,
+                            help='Bulk mode: number of MyModel objects to create')
+        parser.add_argument('--batch-size', type=int, default=1000,
+                            help='Bulk mode: number of rows per bulk_create/transaction')
 
     def handle(self, *args, **options):
+        if options['count'] is not None:
+            return self.handle_bulk(options['count'], options['batch_size'])
+
         for i in range(10):
             MyModel.objects.create(
                 name=f'Object {i}',
@@ -18,3 +29,28 @@ class Command(BaseCommand):
             time.sleep(1)
         self.stdout.write(self.style.SUCCESS('Successfully created 10 MyModel objects'))
 
+    def handle_bulk(self, count, batch_size):
+        if count < 0:
+            raise CommandError('--count must be zero or a positive number')
+        if batch_size < 1:
+            raise CommandError('--batch-size must be a positive number')
+
+        # Rows are generated lazily so memory stays bounded by one batch
+        objs = (
+            MyModel(name=f'Object {i}', description=f'This is object {i}')
+            for i in range(count)
+        )
+
+        created = 0
+        start = time.perf_counter()
+        while batch := list(islice(objs, batch_size)):
+            # One short transaction per batch instead of one per row
+            with transaction.atomic():
+                MyModel.objects.bulk_create(batch, batch_size=batch_size)
+            created += len(batch)
+        elapsed = time.perf_counter() - start
+
+        rate = created / elapsed if elapsed > 0 else float(created)
+        self.stdout.write(self.style.SUCCESS(
+            f'Successfully created {created} MyModel objects in {elapsed:.2f}s ({rate:.0f} rows/sec)'
+        ))
@@ -1,14 +1,59 @@
-from django.core.management.base import BaseCommand
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections, transaction
 from myapp.models import MyModel
 from django.utils import timezone
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack
+import multiprocessing
+import django
+import os
 import time
 from faker import Faker
 
 
+def generate_rows(seed, size):
+    """
+    Runs inside a worker process: build `size` (name, description) pairs with a Faker seeded by `seed`.
+    Plain tuples are returned because they are cheap to pickle back to the writer.
+    """
+    faker = Faker()
+    faker.seed_instance(seed)
+    return [(faker.name(), faker.text()) for _ in range(size)]
+
+
+def bounded_map(executor, func, *iterables, window):
+    """
+    executor.map() that keeps at most `window` calls in flight: the next batch is submitted as the oldest result
+    is handed out. map() submits every call up front, so for millions of rows the generated batches waiting for
+    the single SQLite writer would only be bounded by how fast it keeps up.
+    """
+    pending = deque()
+    for args in zip(*iterables):
+        if len(pending) >= window:
+            yield pending.popleft().result()
+        pending.append(executor.submit(func, *args))
+    while pending:
+        yield pending.popleft().result()
+
+
 class Command(BaseCommand):
     help = 'This command will create a MyModel object with fake data using Faker'
 
+    def add_arguments(self, parser):
+        parser.add_argument('--count', type=int, default=None,
+                            help='Parallel mode: number of MyModel objects to create')
+        parser.add_argument('--batch-size', type=int, default=1000,
+                            help='Parallel mode: rows generated per worker task and inserted per transaction')
+        parser.add_argument('--workers', type=int, default=os.cpu_count(),
+                            help='Parallel mode: number of worker processes generating fake data')
+        parser.add_argument('--seed', type=int, default=0,
+                            help='Parallel mode: base seed, batch i is generated with seed + i')
+
     def handle(self, *args, **options):
+        if options['count'] is not None:
+            return self.handle_parallel(options['count'], options['batch_size'], options['workers'], options['seed'])
+
         # Initialize Faker
         faker = Faker()
 
@@ -27,4 +72,41 @@ class Command(BaseCommand):
         print("### fake_instance.name:",fake_instance.name,
               "fake_instance.description:", fake_instance.description)
 
+    def handle_parallel(self, count, batch_size, workers, seed):
+        if count < 0:
+            raise CommandError('--count must be zero or a positive number')
+        if batch_size < 1 or workers < 1:
+            raise CommandError('--batch-size and --workers must be positive numbers')
+
+        sizes = [min(batch_size, count - offset) for offset in range(0, count, batch_size)]
+        # Seeds are tied to the batch, not to the process, so the output is the same for any --workers value
+        seeds = [seed + i for i in range(len(sizes))]
+
+        created = 0
+        start = time.perf_counter()
+        with ExitStack() as stack:
+            if workers == 1 or multiprocessing.current_process().daemon:
+                # Generate in this process: with one worker there is nothing to gain, and daemonic processes
+                # (e.g. `manage.py test --parallel` workers) are not allowed to start children
+                batches = map(generate_rows, seeds, sizes)
+            else:
+                # Don't hand an open SQLite connection over to forked workers; only this process writes
+                connections.close_all()
+                executor = stack.enter_context(ProcessPoolExecutor(max_workers=workers, initializer=django.setup))
+                # Batches come back in submission order while the workers keep generating up to two batches
+                # each ahead of the writer
+                batches = bounded_map(executor, generate_rows, seeds, sizes, window=2 * workers)
+            for rows in batches:
+                with transaction.atomic():
+                    MyModel.objects.bulk_create(
+                        [MyModel(name=name, description=description) for name, description in rows],
+                        batch_size=batch_size,
+                    )
+                created += len(rows)
+        elapsed = time.perf_counter() - start
 
+        rate = created / elapsed if elapsed > 0 else float(created)
+        self.stdout.write(self.style.SUCCESS(
+            f'Successfully created {created} MyModel objects with {workers} workers '
+            f'in {elapsed:.2f}s ({rate:.0f} rows/sec)'
+        ))
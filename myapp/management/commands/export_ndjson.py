@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+from myapp.exports import EXPORT_CHUNK_SIZE, EXPORT_MODELS, iter_ndjson
+
+
+class Command(BaseCommand):
+    help = 'This command will stream a whole MyModel/MyProduct table as NDJSON (one JSON object per line)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('model', choices=sorted(EXPORT_MODELS))
+        parser.add_argument('--output', default=None,
+                            help='File to write to, defaults to stdout')
+        parser.add_argument('--chunk-size', type=int, default=EXPORT_CHUNK_SIZE,
+                            help='Number of rows fetched from the database at a time')
+
+    def handle(self, *args, **options):
+        lines = iter_ndjson(options['model'], chunk_size=options['chunk_size'])
+        if options['output'] is None:
+            for line in lines:
+                self.stdout.write(line, ending='')
+            return
+
+        count = 0
+        with open(options['output'], 'w', encoding='utf-8') as output:
+            for line in lines:
+                output.write(line)
+                count += 1
+        self.stderr.write(self.style.SUCCESS(f'Exported {count} rows to {options["output"]}'))
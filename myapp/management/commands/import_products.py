@@ -0,0 +1,89 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from myapp.models import MyProduct
+import json
+import time
+
+
+class Command(BaseCommand):
+    help = 'This command will upsert MyProduct objects from a JSONL file (one {"unique_code", "name"} object per line)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='JSONL file to import')
+        parser.add_argument('--batch-size', type=int, default=1000,
+                            help='Number of products upserted per bulk_create/transaction')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        if batch_size < 1:
+            raise CommandError('--batch-size must be a positive number')
+
+        name_length = MyProduct._meta.get_field('name').max_length
+        code_length = MyProduct._meta.get_field('unique_code').max_length
+
+        seen_codes = set()
+        batch = {}  # unique_code -> MyProduct, a code can only be upserted once per statement
+        upserted = duplicates = bad_lines = 0
+        start = time.perf_counter()
+
+        try:
+            file = open(options['path'], encoding='utf-8')
+        except OSError as e:
+            raise CommandError(f'Cannot open {options["path"]}: {e}')
+
+        with file:
+            # The file is read line by line and only one batch of products is held in memory. seen_codes, used
+            # to report duplicates, still grows with the number of distinct codes in the file.
+            for line_number, line in enumerate(file, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    data = json.loads(line)
+                    unique_code, name = data['unique_code'], data['name']
+                    if not isinstance(unique_code, str) or not isinstance(name, str):
+                        raise TypeError('unique_code and name must be strings')
+                    unique_code, name = unique_code.strip(), name.strip()
+                except (ValueError, TypeError, KeyError) as e:
+                    bad_lines += 1
+                    self.stderr.write(f'Line {line_number}: skipped, {e.__class__.__name__}: {e}')
+                    continue
+                if not unique_code or not name or len(unique_code) > code_length or len(name) > name_length:
+                    bad_lines += 1
+                    self.stderr.write(f'Line {line_number}: skipped, invalid unique_code or name')
+                    continue
+
+                if unique_code in seen_codes:
+                    # The later line wins, like it would if the file was imported row by row
+                    duplicates += 1
+                    self.stderr.write(f'Line {line_number}: duplicate unique_code {unique_code!r}')
+                seen_codes.add(unique_code)
+
+                batch[unique_code] = MyProduct(unique_code=unique_code, name=name)
+                if len(batch) >= batch_size:
+                    upserted += self.upsert(batch)
+                    batch = {}
+
+        if batch:
+            upserted += self.upsert(batch)
+        elapsed = time.perf_counter() - start
+
+        rate = upserted / elapsed if elapsed > 0 else float(upserted)
+        self.stdout.write(self.style.SUCCESS(
+            f'Upserted {upserted} products in {elapsed:.2f}s ({rate:.0f} rows/sec), '
+            f'{duplicates} duplicate codes, {bad_lines} bad lines'
+        ))
+
+    def upsert(self, batch):
+        with transaction.atomic():
+            # Existing products keep their slug, only the name is refreshed. Their current slug is set on the
+            # objects so the slug allocator only runs for the new codes.
+            existing = MyProduct.objects.filter(unique_code__in=batch).values_list('unique_code', 'slug')
+            for unique_code, slug in existing:
+                batch[unique_code].slug = slug
+            MyProduct.objects.bulk_create(
+                batch.values(),
+                update_conflicts=True,
+                unique_fields=['unique_code'],
+                update_fields=['name'],
+            )
+        return len(batch)
@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections, router
+from myapp.models import MyModel
+from myapp.search import create_search_index, rebuild_search_index
+import time
+
+
+class Command(BaseCommand):
+    help = 'This command will rebuild the MyModel full-text search index (FTS5) from the myapp_mymodel rows'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--optimize', action='store_true',
+                            help='Also merge the index into a single b-tree after rebuilding it')
+
+    def handle(self, *args, **options):
+        connection = connections[router.db_for_write(MyModel)]
+        if connection.vendor != 'sqlite':
+            raise CommandError('The search index is an SQLite FTS5 table, this database is not SQLite')
+        start = time.perf_counter()
+        create_search_index(connection)  # In case the table or its triggers are missing
+        rebuild_search_index(connection, optimize=options['optimize'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Rebuilt the search index for {MyModel.objects.using(connection.alias).count()} MyModel objects '
+            f'in {time.perf_counter() - start:.2f}s'
+        ))
@@ -0,0 +1,40 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from myapp.routers import PRIMARY, REPLICA, forget_replica_check
+import time
+
+
+class Command(BaseCommand):
+    help = 'This command will copy the primary SQLite database into the replica used for MyModel/MyProduct reads'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--interval', type=float, default=0.0,
+                            help='Keep syncing every INTERVAL seconds instead of syncing once')
+
+    def handle(self, *args, **options):
+        if REPLICA not in connections.settings:
+            raise CommandError(f'No {REPLICA!r} database is configured')
+        if options['interval'] < 0:
+            raise CommandError('--interval must not be negative')
+        primary, replica = connections[PRIMARY], connections[REPLICA]
+        if primary.vendor != 'sqlite' or replica.vendor != 'sqlite':
+            raise CommandError('sync_replica only copies SQLite databases')
+
+        while True:
+            start = time.perf_counter()
+            primary.ensure_connection()
+            replica.ensure_connection()
+            # SQLite's online backup API in a single step: a consistent snapshot of the primary. A backup copied
+            # in several steps starts over whenever the primary is written in between, so it never finishes under
+            # load. The single step only holds a read transaction, which doesn't block writers in WAL mode.
+            # Readers of the replica see the old copy until the backup commits, then the new one.
+            primary.connection.backup(replica.connection)
+            # The router of this process doesn't wait for its next check to use (or stop using) the new copy
+            forget_replica_check()
+            self.stdout.write(self.style.SUCCESS(
+                f'Synced {primary.settings_dict["NAME"]} to {replica.settings_dict["NAME"]} '
+                f'in {time.perf_counter() - start:.2f}s'
+            ))
+            if not options['interval']:
+                break
+            time.sleep(options['interval'])
@@ -0,0 +1,65 @@
+import threading
+from bisect import bisect_left
+
+# Prometheus' default histogram buckets, in seconds
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1.0, 2.5, 5.0, 7.5, 10.0)
+
+
+class Histogram:
+    """
+    Minimal Prometheus style histogram with a single label. Values live in this process only,
+    so with several worker processes every process exposes its own numbers.
+    """
+
+    def __init__(self, name, documentation, label, buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.label = label
+        self.buckets = tuple(buckets)
+        self._series = {}  # label value -> [bucket counts..., +Inf count, sum]
+        self._lock = threading.Lock()
+
+    def observe(self, label_value, value):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(label_value)
+            if series is None:
+                series = self._series[label_value] = [0] * (len(self.buckets) + 1) + [0.0]
+            series[index] += 1
+            series[-1] += value
+
+    def clear(self):
+        with self._lock:
+            self._series.clear()
+
+    def render(self):
+        """
+        Text exposition format, see https://prometheus.io/docs/instrumenting/exposition_formats/
+        """
+        with self._lock:
+            series = {label_value: list(values) for label_value, values in self._series.items()}
+
+        lines = [
+            f'# HELP {self.name} {self.documentation}',
+            f'# TYPE {self.name} histogram',
+        ]
+        for label_value, values in sorted(series.items()):
+            label = f'{self.label}="{label_value}"'
+            cumulative = 0
+            for upper_bound, count in zip(self.buckets + ('+Inf',), values):
+                cumulative += count
+                lines.append(f'{self.name}_bucket{{{label},le="{upper_bound}"}} {cumulative}')
+            lines.append(f'{self.name}_sum{{{label}}} {values[-1]}')
+            lines.append(f'{self.name}_count{{{label}}} {cumulative}')
+        return '\n'.join(lines) + '\n'
+
+
+request_latency = Histogram(
+    'myapp_request_latency_seconds',
+    'Time spent handling a request, by URL name.',
+    label='view',
+)
+
+
+def render_metrics():
+    return request_latency.render()
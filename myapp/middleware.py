@@ -0,0 +1,164 @@
+import logging
+import time
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from .metrics import request_latency
+from .routers import replica_scope
+
+logger = logging.getLogger(__name__)
+
+
+def latency_label(request):
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return 'unresolved'
+    # All admin pages share one series instead of one per admin URL name
+    if 'admin' in match.namespaces:
+        return 'admin'
+    return match.url_name or 'unnamed'
+
+
+class LatencyMiddleware:
+    """
+    Records the time spent below this middleware in the request_latency histogram, by URL name.
+    Works in front of both sync and async views, so put it first in MIDDLEWARE.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        start = time.perf_counter()
+        response = self.get_response(request)
+        request_latency.observe(latency_label(request), time.perf_counter() - start)
+        return response
+
+    async def __acall__(self, request):
+        start = time.perf_counter()
+        response = await self.get_response(request)
+        request_latency.observe(latency_label(request), time.perf_counter() - start)
+        return response
+
+
+class ReplicaPinningMiddleware:
+    """
+    Gives every request its own read-your-writes scope for PrimaryReplicaRouter: reads may go to the replica
+    until the request writes something, then they stay on the primary until the response is returned.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        with replica_scope():
+            return self.get_response(request)
+
+    async def __acall__(self, request):
+        # Writes made in sync_to_async threads pin this scope too, asgiref copies context changes back
+        with replica_scope():
+            return await self.get_response(request)
+
+
+class QueryCountMiddleware:
+    """
+    Dev/test helper: counts the SQL queries a request runs and the time spent in them, and reports both in the
+    X-DB-Query-Count / X-DB-Query-Time-Ms response headers (and in the myapp.middleware log).
+    Enabled by settings.QUERY_COUNT_MIDDLEWARE, otherwise Django drops it from the stack at startup.
+
+    Works in front of both sync and async views. count_query() is installed once on the connections of the
+    thread that runs the queries (the request's thread, or the thread that an async view's sync_to_async calls
+    share) and adds every query to the counter of the request it runs for, found in a context variable, so
+    concurrent async requests served by one thread are counted apart.
+    Queries run while a StreamingHttpResponse is consumed happen after it returns and are not counted.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'QUERY_COUNT_MIDDLEWARE', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        install_query_counting()
+        counter = QueryCounter()
+        token = _request_queries.set(counter)
+        try:
+            response = self.get_response(request)
+        finally:
+            _request_queries.reset(token)
+        return self.report(request, response, counter)
+
+    async def __acall__(self, request):
+        await sync_to_async(install_query_counting)()
+        counter = QueryCounter()
+        token = _request_queries.set(counter)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _request_queries.reset(token)
+        return self.report(request, response, counter)
+
+    def report(self, request, response, counter):
+        response['X-DB-Query-Count'] = str(counter.count)
+        response['X-DB-Query-Time-Ms'] = f'{counter.duration * 1000:.2f}'
+        logger.debug(
+            'Request queries',
+            extra={'path': request.path, 'query_count': counter.count, 'query_time_ms': round(counter.duration * 1000, 2)},
+        )
+        return response
+
+
+# The QueryCounter of the request being served in this context, None outside QueryCountMiddleware
+_request_queries = ContextVar('myapp_request_queries', default=None)
+
+
+def count_query(execute, sql, params, many, context):
+    counter = _request_queries.get()
+    if counter is None:
+        return execute(sql, params, many, context)
+    return counter(execute, sql, params, many, context)
+
+
+def install_query_counting():
+    # Connections are per thread, each one gets the wrapper the first time it serves a request
+    for connection in connections.all():
+        if count_query not in connection.execute_wrappers:
+            connection.execute_wrappers.append(count_query)
+
+
+class QueryCounter:
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.count += 1
+            self.duration += time.perf_counter() - start
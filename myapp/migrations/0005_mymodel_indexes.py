@@ -0,0 +1,21 @@
+# Generated by Django 5.1 on 2026-10-18 11:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('myapp', '0004_myproduct_slug'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='mymodel',
+            index=models.Index(fields=['created_at', 'id'], name='myapp_mymodel_created_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='mymodel',
+            index=models.Index(fields=['name'], name='myapp_mymodel_name_idx'),
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.1 on 2026-10-18 12:43
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def deduplicate_slugs(apps, schema_editor):
+    # Before the unique index: empty slugs become NULL and repeated slugs get the next free "-N" suffix
+    MyProduct = apps.get_model('myapp', 'MyProduct')
+    products = MyProduct.objects.using(schema_editor.connection.alias)
+    products.filter(slug='').update(slug=None)
+    duplicated = (
+        products.filter(slug__isnull=False).values('slug').annotate(count=Count('id')).filter(count__gt=1)
+        .values_list('slug', flat=True)
+    )
+    for slug in list(duplicated):
+        counter = 1
+        for product in products.filter(slug=slug).order_by('id')[1:]:
+            counter += 1
+            while products.filter(slug=f'{slug}-{counter}').exists():
+                counter += 1
+            product.slug = f'{slug}-{counter}'
+            product.save(update_fields=['slug'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('myapp', '0006_mymodelarchive'),
+    ]
+
+    operations = [
+        migrations.RunPython(deduplicate_slugs, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='myproduct',
+            name='slug',
+            field=models.SlugField(blank=True, null=True, unique=True),
+        ),
+    ]
@@ -1,4 +1,5 @@
-from django.db import models
+from django.db import models, router
+from .slugs import slug_allocator
 
 # Create your models here.
 class MyModel(models.Model):
@@ -7,11 +8,61 @@ class MyModel(models.Model):
     created_at = models.DateTimeField(auto_now_add=True, null=True)
     updated_at = models.DateTimeField(auto_now=True, null=True)
 
+    class Meta:
+        indexes = [
+            # Listings are ordered by date, with id as the tie-breaker for keyset pagination
+            models.Index(fields=['created_at', 'id'], name='myapp_mymodel_created_id_idx'),
+            models.Index(fields=['name'], name='myapp_mymodel_name_idx'),
+        ]
+
+
+class MyModelArchive(models.Model):
+    # MyModel rows moved out of the hot table by the archive_mymodels command, with their original ids
+    id = models.BigIntegerField(primary_key=True)
+    name = models.CharField(max_length=100)
+    description = models.TextField(null=True, blank=True)
+    created_at = models.DateTimeField(null=True)
+    updated_at = models.DateTimeField(null=True)
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+
+class ArchiveCheckpoint(models.Model):
+    # Progress of an archive_mymodels run: ids up to last_id are done, the run is finished at max_id
+    name = models.CharField(max_length=100, unique=True)
+    cutoff = models.DateTimeField()
+    last_id = models.BigIntegerField()
+    max_id = models.BigIntegerField()
+    updated_at = models.DateTimeField(auto_now=True)
+
+
+class MyProductQuerySet(models.QuerySet):
+    def bulk_create(self, objs, *args, **kwargs):
+        # bulk_create does not send pre_save, so signals.generate_slug never sees these objects.
+        # Fill the missing slugs for the whole batch here before the insert.
+        objs = list(objs)
+        objs = slug_allocator.insert(objs, lambda: super(MyProductQuerySet, self).bulk_create(objs, *args, **kwargs),
+                                     using=self.db, ignore_conflicts=kwargs.get('ignore_conflicts', False))
+        if kwargs.get('update_conflicts'):
+            # Upserts skip post_save too, drop the cached copies of the rows that may have changed
+            from .product_cache import invalidate_products
+            invalidate_products(objs, using=self.db)
+        return objs
+
 
 class MyProduct(models.Model):
     name = models.CharField(max_length=100)
     unique_code = models.CharField(max_length=50, unique=True)  # unique_code must be unique
-    slug = models.SlugField(null=True, blank=True)
+    slug = models.SlugField(null=True, blank=True, unique=True)  # filled by myapp.slugs.slug_allocator
+
+    objects = MyProductQuerySet.as_manager()
+
+    def save(self, *args, **kwargs):
+        if self.slug:
+            return super().save(*args, **kwargs)
+        # Allocate the slug in the same transaction as the insert, so a slug taken in the meantime is retried.
+        # signals.generate_slug still covers the saves that don't go through here (loaddata).
+        using = kwargs.get('using') or router.db_for_write(MyProduct, instance=self)
+        slug_allocator.insert([self], lambda: super(MyProduct, self).save(*args, **kwargs), using=using)
 
     def __str__(self):
         return self.name
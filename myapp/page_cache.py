@@ -0,0 +1,16 @@
+from django.core.cache import cache
+
+# Rendered home pages are kept for this many seconds, login/logout drop them right away
+HOME_CACHE_TIMEOUT = 300
+
+
+def home_cache_key(user):
+    # The home page only depends on request.user: one entry per user, one shared by all anonymous visitors
+    if user.is_authenticated:
+        return f'myapp:home:user:{user.pk}'
+    return 'myapp:home:anonymous'
+
+
+def invalidate_home_page(user):
+    if user is not None:
+        cache.delete(home_cache_key(user))
@@ -0,0 +1,64 @@
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS, transaction
+from .models import MyProduct
+from .routers import PRIMARY
+
+# Cache alias from settings.CACHES. LocMemCache keeps its keys in LRU order and evicts the least recently
+# used entries once OPTIONS['MAX_ENTRIES'] is reached, so the cache stays bounded.
+PRODUCT_CACHE_ALIAS = 'products'
+
+
+def _cache():
+    return caches[PRODUCT_CACHE_ALIAS]
+
+def _pk_key(pk):
+    return f'myproduct:pk:{pk}'
+
+def _lookup_key(field, value):
+    return f'myproduct:{field}:{value}'
+
+
+def _get_product(field, value):
+    """
+    Read-through lookup: `field` value -> pk -> product, both served from the cache after the first hit.
+    Only the pk entry holds the product itself, so invalidating a product is a single delete no matter
+    which lookups pointed at it. A lookup entry whose product no longer matches is treated as a miss.
+    """
+    cache = _cache()
+    pk = cache.get(_lookup_key(field, value))
+    if pk is not None:
+        product = cache.get(_pk_key(pk))
+        if product is not None and getattr(product, field) == value:
+            return product
+
+    # Filled from the primary: a replica that hasn't caught up would keep its stale copy cached until the next
+    # invalidation
+    product = MyProduct.objects.db_manager(PRIMARY).get(**{field: value})  # raises MyProduct.DoesNotExist like the ORM
+    cache.set_many({
+        _lookup_key(field, value): product.pk,
+        _pk_key(product.pk): product,
+    })
+    return product
+
+def get_product_by_unique_code(unique_code):
+    return _get_product('unique_code', unique_code)
+
+def get_product_by_slug(slug):
+    return _get_product('slug', slug)
+
+
+def invalidate_products(products, using=DEFAULT_DB_ALIAS):
+    """
+    Drop the cached copies of `products` once the current transaction on `using` commits (right away outside
+    one). Deleted before the commit, a concurrent read could still find the old row and cache it again.
+    The keys are taken now: after a delete() the product no longer has its pk.
+    """
+    keys = []
+    for product in products:
+        if product.pk is not None:
+            keys.append(_pk_key(product.pk))
+        keys.append(_lookup_key('unique_code', product.unique_code))
+        if product.slug:
+            keys.append(_lookup_key('slug', product.slug))
+    if keys:
+        transaction.on_commit(lambda: _cache().delete_many(keys), using=using)
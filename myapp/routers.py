@@ -0,0 +1,122 @@
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.db import DatabaseError, connections
+from django.db.migrations.recorder import MigrationRecorder
+
+PRIMARY = 'default'
+REPLICA = 'replica'
+ARCHIVE = 'archive'
+# Models whose reads may be served by the replica, everything else (sessions, auth, admin...) stays on the primary
+REPLICA_MODELS = {'myapp.mymodel', 'myapp.myproduct'}
+# The only tables created in the archive database
+ARCHIVE_MODELS = {'myapp.mymodelarchive'}
+
+# How long the result of the replica's schema check is reused, see replica_available()
+REPLICA_CHECK_INTERVAL = 30
+
+# Set by the first write of the current request (or command), after which its reads go to the primary too
+_pinned = ContextVar('myapp_db_pinned_to_primary', default=False)
+_replica_check = {'at': None, 'in_sync': False}
+_replica_check_lock = threading.Lock()
+
+
+def pin_to_primary():
+    _pinned.set(True)
+
+
+def is_pinned_to_primary():
+    return _pinned.get()
+
+
+@contextmanager
+def replica_scope():
+    """
+    Start an unpinned scope (one per request, see ReplicaPinningMiddleware) and drop its pin when it ends,
+    so a write in one request doesn't pin the next request served by the same thread.
+    """
+    token = _pinned.set(False)
+    try:
+        yield
+    finally:
+        _pinned.reset(token)
+
+
+def replica_available():
+    """
+    Whether reads may go to the replica: it is configured, it is a separate database and it is in sync with
+    the primary's schema. The last check is cached for REPLICA_CHECK_INTERVAL seconds per process.
+    """
+    if REPLICA not in connections.settings:
+        return False
+    # Under test the replica is a mirror of the primary (TEST MIRROR): the same database through a second
+    # connection that can't see the test's uncommitted data, so reading from it would only be slower and wrong
+    if connections[REPLICA].settings_dict['NAME'] == connections[PRIMARY].settings_dict['NAME']:
+        return False
+    with _replica_check_lock:
+        now = time.monotonic()
+        if _replica_check['at'] is None or now - _replica_check['at'] >= REPLICA_CHECK_INTERVAL:
+            _replica_check.update(at=now, in_sync=replica_in_sync(connections[PRIMARY], connections[REPLICA]))
+        return _replica_check['in_sync']
+
+
+def replica_in_sync(primary, replica):
+    """
+    False while the replica file doesn't exist yet (sync_replica has never run) or when it misses migrations
+    applied to the primary since the last sync: its tables would be missing or have the old columns.
+    """
+    if replica.vendor == 'sqlite' and not os.path.exists(replica.settings_dict['NAME']):
+        # Connecting would create an empty database file
+        return False
+    try:
+        return applied_migrations(replica) == applied_migrations(primary)
+    except DatabaseError:
+        return False
+
+
+def applied_migrations(connection):
+    table = MigrationRecorder.Migration._meta.db_table
+    if table not in connection.introspection.table_names():
+        return set()
+    with connection.cursor() as cursor:
+        cursor.execute(f'SELECT app, name FROM {connection.ops.quote_name(table)}')
+        return set(cursor.fetchall())
+
+
+def forget_replica_check():
+    with _replica_check_lock:
+        _replica_check['at'] = None
+
+
+class PrimaryReplicaRouter:
+    """
+    Sends MyModel/MyProduct reads to the `replica` database and everything else to the primary, with
+    read-your-writes: once the current request has written anything, or while it is inside a transaction on the
+    primary, its reads stay on the primary.
+    """
+
+    def db_for_read(self, model, **hints):
+        if model._meta.label_lower not in REPLICA_MODELS or _pinned.get():
+            return PRIMARY
+        if connections[PRIMARY].in_atomic_block or not replica_available():
+            return PRIMARY
+        return REPLICA
+
+    def db_for_write(self, model, **hints):
+        pin_to_primary()
+        return PRIMARY
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Both aliases hold the same data
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # The replica is a copy of the primary's file (see the sync_replica command), never migrated by itself
+        if db == REPLICA:
+            return False
+        if db == ARCHIVE:
+            return f'{app_label}.{model_name}' in ARCHIVE_MODELS
+        return True
@@ -0,0 +1,123 @@
+"""
+Full-text search over MyModel.name/description with an SQLite FTS5 index.
+
+myapp_mymodel_fts is an external-content FTS5 table: it stores only the index, the text stays in myapp_mymodel.
+Triggers on myapp_mymodel keep it in sync for every write path (save(), bulk_create(), update(), delete(),
+loaddata, raw SQL), which signals can't do. The schema is created by the post_migrate receiver in
+myapp.signals rather than by a migration so it also exists in test databases built without migrations, and
+comes back when a migration rebuilds myapp_mymodel (SQLite drops a table's triggers with it).
+"""
+
+import re
+
+from django.db.models.expressions import RawSQL
+from .models import MyModel
+
+FTS_TABLE = 'myapp_mymodel_fts'
+# bm25() weights per column: a match in the name counts ten times more than one in the description
+FTS_RANK = 'bm25(10.0, 1.0)'
+# Only the newest FTS_RANK_CANDIDATES matches are ranked, so a word found in millions of rows costs the same
+# as a rare one
+FTS_RANK_CANDIDATES = 2000
+# The last word is searched as a prefix from this length on, shorter prefixes match too many words.
+# The index keeps a prefix index for exactly this length (prefix='3').
+FTS_PREFIX_MIN_LENGTH = 3
+
+_SCHEMA = [
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        name, description, content='myapp_mymodel', content_rowid='id', tokenize='unicode61 remove_diacritics 2',
+        prefix='3'
+    )""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON myapp_mymodel BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, name, description) VALUES (new.id, new.name, new.description);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON myapp_mymodel BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, description)
+        VALUES ('delete', old.id, old.name, old.description);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE OF id, name, description ON myapp_mymodel BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, description)
+        VALUES ('delete', old.id, old.name, old.description);
+        INSERT INTO {FTS_TABLE}(rowid, name, description) VALUES (new.id, new.name, new.description);
+    END""",
+]
+
+
+def search_index_exists(connection):
+    return connection.vendor == 'sqlite' and FTS_TABLE in connection.introspection.table_names()
+
+
+def create_search_index(connection):
+    """
+    Create the FTS table and its triggers if they are missing. A new index is filled from the existing rows.
+    """
+    if connection.vendor != 'sqlite':
+        return
+    created = not search_index_exists(connection)
+    with connection.cursor() as cursor:
+        for sql in _SCHEMA:
+            cursor.execute(sql)
+        if created:
+            cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rank) VALUES ('rank', %s)", [FTS_RANK])
+            cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+
+
+def rebuild_search_index(connection, optimize=False):
+    with connection.cursor() as cursor:
+        # 'rebuild' drops the index and reads every row of myapp_mymodel again
+        cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+        if optimize:
+            # Merge the index b-trees into one, for faster queries after many small writes
+            cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('optimize')")
+
+
+def fts_query(text):
+    """
+    Turn user input into an FTS5 query: every word must match, the last one as a prefix (search as you type)
+    when it is long enough. Words are quoted so FTS5 operators and syntax in the input are searched for as
+    plain text. None when there is nothing to search for.
+    """
+    words = re.findall(r'\w+', text)
+    if not words:
+        return None
+    query = ' '.join(f'"{word}"' for word in words)
+    if len(words[-1]) >= FTS_PREFIX_MIN_LENGTH:
+        query += '*'
+    return query
+
+
+def search_mymodels(text, limit, using=None):
+    """
+    Best matches first, among the newest FTS_RANK_CANDIDATES matches. FTS5 finds, ranks and limits inside the
+    index, only the returned rows are read from myapp_mymodel. Each object gets a `rank` attribute (lower is
+    better).
+    """
+    query = fts_query(text)
+    if query is None:
+        return []
+    return list(MyModel.objects.db_manager(using).raw(
+        f"""SELECT myapp_mymodel.*, matches.rank AS rank
+            FROM (
+                SELECT rowid, rank FROM {FTS_TABLE}
+                WHERE {FTS_TABLE} MATCH %s AND rowid >= (
+                    SELECT MIN(rowid) FROM (
+                        SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s ORDER BY rowid DESC LIMIT %s
+                    )
+                )
+                ORDER BY rank LIMIT %s
+            ) matches
+            JOIN myapp_mymodel ON myapp_mymodel.id = matches.rowid
+            ORDER BY matches.rank""",
+        [query, query, FTS_RANK_CANDIDATES, limit],
+    ))
+
+
+def search_filter(text, limit=FTS_RANK_CANDIDATES):
+    """
+    Expression for `filter(id__in=...)` with the ids of the newest `limit` rows that match `text`. Like the
+    ranking in search_mymodels(), a word found in millions of rows costs the same as a rare one.
+    """
+    return RawSQL(
+        f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s ORDER BY rowid DESC LIMIT %s',
+        [fts_query(text), limit],
+    )
@@ -1,9 +1,42 @@
-from django.db.models.signals import pre_save
+from django.db import connections, router
+from django.db.backends.signals import connection_created
+from django.db.models.signals import pre_save, post_save, post_delete, post_migrate
 from django.dispatch import receiver
-from django.utils.text import slugify
-from .models import MyProduct
+from django.contrib.auth.signals import user_logged_in, user_logged_out
+from .models import MyModel, MyProduct
+from .slugs import slug_allocator
+from .product_cache import invalidate_products
+from .page_cache import invalidate_home_page
+from .sqlite import apply_pragmas, get_pragmas
+from .search import create_search_index
 
 @receiver(pre_save, sender=MyProduct)
-def generate_slug(sender, instance, **kwargs):
+def generate_slug(sender, instance, using, **kwargs):
     if not instance.slug:
-        instance.slug = slugify(instance.name)
+        slug_allocator.allocate([instance], using=using)
+
+@receiver(post_save, sender=MyProduct)
+@receiver(post_delete, sender=MyProduct)
+def invalidate_product_cache(sender, instance, using, **kwargs):
+    invalidate_products([instance], using=using)
+
+@receiver(user_logged_in)
+@receiver(user_logged_out)
+def invalidate_home_page_cache(sender, request, user, **kwargs):
+    invalidate_home_page(user)
+
+@receiver(connection_created)
+def configure_sqlite_connection(sender, connection, **kwargs):
+    # Runs once per new connection, with CONN_MAX_AGE that's once per worker thread rather than per request
+    if connection.vendor == 'sqlite':
+        with connection.cursor() as cursor:
+            apply_pragmas(cursor, get_pragmas())
+
+@receiver(post_migrate)
+def create_mymodel_search_index(sender, app_config, using, **kwargs):
+    # After every migrate (and test database setup, with or without migrations): see myapp/search.py
+    if app_config.label != 'myapp' or not router.allow_migrate_model(using, MyModel):
+        return
+    connection = connections[using]
+    if MyModel._meta.db_table in connection.introspection.table_names():
+        create_search_index(connection)
@@ -0,0 +1,131 @@
+import re
+from functools import reduce
+from operator import or_
+
+from django.db import DEFAULT_DB_ALIAS, IntegrityError, transaction
+from django.db.models import Q
+from django.utils.text import slugify
+
+
+class SlugAllocator:
+    """
+    Hands out unique slugs for MyProduct in batches.
+
+    Names that slugify to the same base get "-2", "-3", ... suffixes. Instead of probing the table once per
+    candidate, the allocator reads the used slugs of every base in a batch with one prefix query and numbers
+    the whole batch from there.
+
+    The numbers are read from the database in the transaction that inserts the rows, and the unique index on
+    MyProduct.slug is the source of truth. There is no in-memory cache of the highest suffixes: slugs edited
+    by hand or taken by other processes make it stale, and checking it costs the same query. On SQLite the
+    transaction holds the write lock from its start (transaction_mode IMMEDIATE), so nobody can take a slug
+    between the read and the insert. insert() still retries if the unique index rejects a slug, for databases
+    that don't lock that early.
+    """
+
+    # Keep the OR'ed LIKE clauses well below SQLite's expression depth limit
+    query_chunk_size = 500
+    # insert() attempts before a slug conflict is raised
+    insert_attempts = 5
+
+    def allocate(self, products, using=DEFAULT_DB_ALIAS):
+        """
+        Fill a unique slug on every product in `products` that does not have one yet.
+        """
+        from .models import MyProduct
+
+        # Unsaved model instances are unhashable, so keep (product, base) pairs instead of a dict
+        pending = []
+        for product in products:
+            if not product.slug:
+                base = slugify(product.name)
+                if base:
+                    pending.append((product, base))
+                else:
+                    product.slug = None  # many NULLs fit in the unique index, many "" don't
+        if not pending:
+            return
+
+        bases = sorted({base for _, base in pending})
+        highest = {}  # base slug -> highest used suffix, the bare base counts as 1
+        for start in range(0, len(bases), self.query_chunk_size):
+            chunk = bases[start:start + self.query_chunk_size]
+            patterns = {base: re.compile(rf"^{re.escape(base)}(?:-(\d+))?$") for base in chunk}
+            for base in chunk:
+                highest[base] = 0
+            # "base" itself or anything between "base-" and "base." (slugs are ASCII, "." sorts right after "-").
+            # Unlike slug__startswith (LIKE), these comparisons can use the slug index on SQLite.
+            used = MyProduct.objects.using(using).filter(
+                reduce(or_, (Q(slug=base) | Q(slug__gt=f"{base}-", slug__lt=f"{base}.") for base in chunk))
+            ).values_list("slug", flat=True)
+            for slug in used.iterator():
+                for base, pattern in patterns.items():
+                    match = pattern.match(slug)
+                    if match:
+                        highest[base] = max(highest[base], int(match.group(1) or 1))
+
+        for product, base in pending:
+            counter = highest[base] + 1
+            while self._is_taken(self._candidate(base, counter), highest):
+                counter += 1
+            product.slug = self._candidate(base, counter)
+            highest[base] = counter
+
+    def insert(self, products, insert, using=DEFAULT_DB_ALIAS, ignore_conflicts=False):
+        """
+        Call `insert()`, which writes `products` to the database, with their missing slugs allocated in the same
+        transaction. When the unique index rejects one of the allocated slugs, the slugs are allocated again and
+        the insert is retried. Pass `ignore_conflicts` when the insert skips conflicting rows, so a row skipped
+        because of its slug is caught too.
+        """
+        from .models import MyProduct
+
+        generated = [product for product in products if not product.slug]
+        if transaction.get_connection(using).in_atomic_block:
+            # No retry inside the caller's transaction: that needs a savepoint, which would change how a failed
+            # insert leaves the caller's transaction
+            return self._allocate_and_insert(generated, insert, using, ignore_conflicts)
+        for attempt in range(1, self.insert_attempts + 1):
+            try:
+                with transaction.atomic(using=using):
+                    return self._allocate_and_insert(generated, insert, using, ignore_conflicts)
+            except IntegrityError:
+                slugs = [product.slug for product in generated if product.slug]
+                # Other constraints (unique_code) fail again on every attempt, only a taken slug is worth a retry
+                if attempt == self.insert_attempts or not MyProduct.objects.using(using).filter(slug__in=slugs).exists():
+                    raise
+                for product in generated:
+                    product.slug = None
+
+    def _allocate_and_insert(self, generated, insert, using, ignore_conflicts):
+        from .models import MyProduct
+
+        self.allocate(generated, using=using)
+        result = insert()
+        if ignore_conflicts and generated:
+            # INSERT OR IGNORE also skips a row whose slug is taken. Rows skipped for their unique_code left no
+            # slug behind, a generated slug stored with another unique_code means our row was dropped.
+            stored = dict(
+                MyProduct.objects.using(using)
+                .filter(slug__in=[product.slug for product in generated if product.slug])
+                .values_list("slug", "unique_code")
+            )
+            taken = [product.slug for product in generated if stored.get(product.slug, product.unique_code) != product.unique_code]
+            if taken:
+                raise IntegrityError(f"Slugs already taken by other products: {', '.join(taken)}")
+        return result
+
+    @staticmethod
+    def _candidate(base, counter):
+        return base if counter == 1 else f"{base}-{counter}"
+
+    @staticmethod
+    def _is_taken(candidate, highest):
+        # "foo-2" is taken if it was handed out as a base of its own or as the second "foo"
+        if highest.get(candidate, 0) >= 1:
+            return True
+        prefix, _, suffix = candidate.rpartition("-")
+        return suffix.isdigit() and highest.get(prefix, 0) >= int(suffix)
+
+
+slug_allocator = SlugAllocator()
@@ -0,0 +1,14 @@
+from django.conf import settings
+
+
+def get_pragmas():
+    return getattr(settings, 'SQLITE_PRAGMAS', {})
+
+
+def apply_pragmas(cursor, pragmas):
+    """
+    Run `PRAGMA name = value` for every item of `pragmas` on a DB-API cursor.
+    Names and values come from settings, never from user input.
+    """
+    for name, value in pragmas.items():
+        cursor.execute(f'PRAGMA {name} = {value}')
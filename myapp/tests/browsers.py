@@ -0,0 +1,127 @@
+"""
+Shared browser pool for the functional tests.
+
+Starting Chrome and chromedriver takes seconds, far longer than the tests themselves. The pool starts browsers
+lazily, hands them out to tests, resets their cookies and storage when a test is done and keeps them running for
+the next test, in this process. With `manage.py test --parallel N` every worker has its own pool and its own
+live server, so functional tests also run concurrently.
+
+Environment variables:
+    CHROMEDRIVER               path to chromedriver (default: webdriver/mac_arm/chromedriver)
+    FUNCTIONAL_TEST_BROWSERS   browsers per process, i.e. how many tests can hold one at a time (default: 2)
+    FUNCTIONAL_TEST_HEADED     set to 1 to watch the browsers instead of running them headless
+"""
+
+import multiprocessing.util
+import os
+import threading
+from contextlib import contextmanager
+
+from django.contrib.staticfiles.testing import StaticLiveServerTestCase
+from selenium import webdriver
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.chrome.service import Service
+from selenium.webdriver.chrome.options import Options
+
+
+def make_chrome():
+    # Path to chromedriver
+    webdriver_path = os.environ.get("CHROMEDRIVER", "webdriver/mac_arm/chromedriver")
+
+    # Configure ChromeOptions
+    chrome_options = Options()
+    if os.environ.get("FUNCTIONAL_TEST_HEADED") != "1":
+        chrome_options.add_argument("--headless=new")  # Run Chrome in headless mode (no GUI)
+    chrome_options.add_argument("--disable-gpu")  # Disable GPU acceleration
+    chrome_options.add_argument("--no-sandbox")  # Bypass OS security model which is not supported in Docker
+
+    # Set up Chrome driver with Service and Options
+    return webdriver.Chrome(service=Service(webdriver_path), options=chrome_options)
+
+
+def reset_browser(browser):
+    # Cookies and storage belong to the origin of the current page, so clear them before leaving it
+    if browser.current_url.startswith(("http://", "https://")):
+        browser.execute_script("window.localStorage.clear(); window.sessionStorage.clear();")
+        browser.delete_all_cookies()
+    browser.get("about:blank")
+
+
+class BrowserPool:
+    """
+    At most `size` browsers, each used by one test at a time. acquire() blocks while all of them are in use.
+    """
+
+    def __init__(self, factory, size):
+        self._factory = factory
+        self._slots = threading.BoundedSemaphore(size)
+        self._lock = threading.Lock()
+        self._idle = []
+        self._browsers = []
+
+    def acquire(self):
+        self._slots.acquire()
+        with self._lock:
+            if self._idle:
+                return self._idle.pop()
+        try:
+            browser = self._factory()
+        except BaseException:
+            self._slots.release()
+            raise
+        with self._lock:
+            self._browsers.append(browser)
+        return browser
+
+    def release(self, browser):
+        try:
+            reset_browser(browser)
+        except WebDriverException:
+            # Crashed or hung browser: drop it, the next acquire() starts a new one
+            self._quit(browser)
+        else:
+            with self._lock:
+                self._idle.append(browser)
+        finally:
+            self._slots.release()
+
+    @contextmanager
+    def browser(self):
+        browser = self.acquire()
+        try:
+            yield browser
+        finally:
+            self.release(browser)
+
+    def close(self):
+        with self._lock:
+            browsers, self._browsers, self._idle = self._browsers, [], []
+        for browser in browsers:
+            self._quit(browser)
+
+    def _quit(self, browser):
+        with self._lock:
+            if browser in self._browsers:
+                self._browsers.remove(browser)
+        try:
+            browser.quit()
+        except WebDriverException:
+            pass
+
+
+browser_pool = BrowserPool(make_chrome, size=int(os.environ.get("FUNCTIONAL_TEST_BROWSERS", 2)))
+# Runs at interpreter exit and also when a `--parallel` worker process exits (atexit handlers don't run there)
+multiprocessing.util.Finalize(browser_pool, browser_pool.close, exitpriority=10)
+
+
+class PooledBrowserTestCase(StaticLiveServerTestCase):
+    """
+    StaticLiveServerTestCase with `self.browser` taken from the shared pool for the duration of each test.
+    Tests that drive several browsers at once (e.g. concurrent sessions against the threaded live server) can
+    take more with `with browser_pool.browser() as other:`.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.browser = browser_pool.acquire()
+        self.addCleanup(browser_pool.release, self.browser)
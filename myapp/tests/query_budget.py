@@ -0,0 +1,33 @@
+"""
+Query budgets per URL name, checked by QueryBudgetTestMixin against the X-DB-Query-Count header that
+myapp.middleware.QueryCountMiddleware adds (QUERY_COUNT_MIDDLEWARE must be on, it is by default in dev/tests).
+Lower a budget when a view gets cheaper, never raise one to make a test pass without knowing why.
+Savepoints count as queries: inside a TestCase every atomic block adds a SAVEPOINT/RELEASE pair.
+"""
+
+QUERY_BUDGETS = {
+    "home": 1,  # auth_user, the session comes from the cache
+    "login": 9,  # POST: auth_user, last_login update, session write (cached_db) and their savepoints
+    "logout": 4,  # auth_user, session delete
+    "mymodel_list": 2,  # auth_user, page
+    "mymodel_search": 2,  # auth_user, search
+    "metrics": 0,
+    "admin:index": 2,
+    # auth_user, estimated count, page, and the date hierarchy's MIN/MAX and DISTINCT dates (cached for a minute)
+    "admin:myapp_mymodel_changelist": 5,
+    "admin:myapp_myproduct_changelist": 3,  # auth_user, estimated count, page
+}
+
+
+class QueryBudgetTestMixin:
+    query_budgets = QUERY_BUDGETS
+
+    def assertWithinQueryBudget(self, response):
+        view_name = response.resolver_match.view_name
+        self.assertIn(view_name, self.query_budgets, f"No query budget declared for {view_name!r}")
+        self.assertIn("X-DB-Query-Count", response, "QueryCountMiddleware is not enabled")
+        count = int(response["X-DB-Query-Count"])
+        budget = self.query_budgets[view_name]
+        self.assertLessEqual(
+            count, budget, f"{view_name} ran {count} queries, its budget is {budget}"
+        )
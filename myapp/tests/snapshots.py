@@ -0,0 +1,97 @@
+"""
+Fixture snapshots for TransactionTestCase.
+
+TransactionTestCase flushes the database after every test and runs `loaddata` for its fixtures before the
+next one, which opens, parses and deserializes the fixture files again every time. Here each fixture file is
+deserialized once per process into plain field values, and every test restores it with one bulk INSERT per
+model (raw, like loaddata: no auto_now/auto_now_add). The bulk INSERT sends no signals, while loaddata's raw
+save sends pre_save/post_save with raw=True, so fixtures with objects of a model that has pre_save or
+post_save receivers (e.g. MyProduct's slug and cache receivers) keep going through loaddata.
+"""
+
+import os
+
+from django.core import serializers
+from django.core.management import call_command
+from django.core.management.color import no_style
+from django.db import connections, transaction
+from django.db.models.signals import post_save, pre_save
+from myapp.tests.touched_tables import TouchedTablesTransactionTestCase
+
+_snapshots = {}  # fixture path -> [(model, [field values per object])], or None if it needs loaddata
+
+
+def get_snapshot(fixture):
+    if fixture not in _snapshots:
+        _snapshots[fixture] = _build_snapshot(fixture)
+    return _snapshots[fixture]
+
+
+def _build_snapshot(fixture):
+    # Only plain file paths are snapshotted, anything loaddata has to look up (app fixture dirs,
+    # FIXTURE_DIRS, compressed files...) keeps going through loaddata
+    if not os.path.isfile(fixture):
+        return None
+    _, ext = os.path.splitext(fixture)
+    format = ext.lstrip(".")
+    if format not in serializers.get_public_serializer_formats():
+        return None
+
+    by_model = {}
+    with open(fixture, encoding="utf-8") as file:
+        for deserialized in serializers.deserialize(format, file, ignorenonexistent=True, handle_forward_references=True):
+            # Many-to-many data and forward references need the objects to be saved first, leave those to loaddata
+            if deserialized.m2m_data or deserialized.deferred_fields:
+                return None
+            obj = deserialized.object
+            # Their receivers run under loaddata and would not run on a restore
+            if pre_save.has_listeners(type(obj)) or post_save.has_listeners(type(obj)):
+                return None
+            fields = obj._meta.concrete_fields
+            by_model.setdefault(type(obj), []).append({field.attname: field.value_from_object(obj) for field in fields})
+    return list(by_model.items())
+
+
+def restore_snapshot(fixture, using):
+    snapshot = get_snapshot(fixture)
+    if snapshot is None:
+        call_command("loaddata", fixture, verbosity=0, database=using)
+        return
+
+    connection = connections[using]
+    with transaction.atomic(using=using):
+        for model, rows in snapshot:
+            fields = model._meta.concrete_fields
+            objs = [model(**values) for values in rows]
+            batch_size = max(1, connection.ops.bulk_batch_size(fields, objs))
+            for start in range(0, len(objs), batch_size):
+                # QuerySet._insert(raw=True) is the bulk form of the raw save() loaddata does per object
+                model._base_manager.using(using)._insert(
+                    objs[start:start + batch_size], fields=fields, raw=True, using=using
+                )
+
+        # Same as loaddata: move the sequences past the primary keys that came from the fixture
+        sequence_sql = connection.ops.sequence_reset_sql(no_style(), [model for model, _ in snapshot])
+        if sequence_sql:
+            with connection.cursor() as cursor:
+                for sql in sequence_sql:
+                    cursor.execute(sql)
+
+
+class FixtureSnapshotTransactionTestCase(TouchedTablesTransactionTestCase):
+    """
+    TransactionTestCase that restores `fixtures` from the per-process snapshots instead of running loaddata
+    before every test.
+    """
+
+    def _fixture_setup(self):
+        # Let TransactionTestCase do everything but the loaddata call
+        fixtures, self.fixtures = self.fixtures, None
+        try:
+            super()._fixture_setup()
+        finally:
+            self.fixtures = fixtures
+        if fixtures:
+            for db_name in self._databases_names(include_mirrors=False):
+                for fixture in fixtures:
+                    restore_snapshot(fixture, db_name)
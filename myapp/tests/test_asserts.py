@@ -0,0 +1,63 @@
+from django.test import TestCase
+
+
+class MyTestAssertsCase(TestCase):
+    def test_asserts(self):
+        # region assertEqual
+        self.assertEqual(1, 1)
+        self.assertEqual(1, 1, "1 should be equal to 1")
+        # endregion
+
+        # region assertNotEqual
+        self.assertNotEqual(1, 2)
+        self.assertNotEqual(1, 2, "1 should not be equal to 2")
+        # endregion
+
+        # region assertTrue
+        self.assertTrue(True)
+        self.assertTrue(True, "True should be True")
+        # endregion
+
+        # region assertFalse
+        self.assertFalse(False)
+        self.assertFalse(False, "False should be False")
+        # endregion
+
+        # region assertIsNone
+        self.assertIsNone(None)
+        self.assertIsNone(None, "None should be None")
+        # endregion
+
+        # region assertIsNotNone
+        self.assertIsNotNone(1)
+        self.assertIsNotNone(1, "1 should not be None")
+        # endregion
+
+        # region assertIn
+        self.assertIn("a", ["a", "b", "c"])
+        self.assertIn("a", ["a", "b", "c"], "'a' should be in the list")
+        # endregion
+
+        # region assertNotIn
+        self.assertNotIn("x", ["a", "b", "c"])
+        self.assertNotIn("x", ["a", "b", "c"], "'x' should not be in the list")
+        # endregion
+
+        # region assertIsInstance
+        self.assertIsInstance(1, int)
+        self.assertIsInstance(1, int, "1 should be an integer")
+        # endregion
+
+        # region assertNotIsInstance
+        self.assertNotIsInstance(1, str)
+        self.assertNotIsInstance(1, str, "1 should not be a string")
+        # endregion
+
+        # region assertRaises
+        with self.assertRaises(ValueError):
+            raise ValueError
+        # endregion
+
+        # region assertRaisesMessage
+        with self.assertRaisesMessage(ValueError, "Some message"):
+            raise ValueError("Some message")
@@ -0,0 +1,89 @@
+from django.test import TestCase
+from django.urls import reverse
+from django.contrib.auth.models import User
+from django.core.cache import cache, caches
+from unittest import mock
+
+from myapp.models import MyProduct
+from myapp.page_cache import home_cache_key
+from myapp.product_cache import PRODUCT_CACHE_ALIAS, get_product_by_slug, get_product_by_unique_code
+from myapp.routers import replica_scope
+from myapp.tests.touched_tables import TouchedTablesTransactionTestCase
+
+
+class MyProductCacheTestCase(TestCase):
+    def setUp(self):
+        caches[PRODUCT_CACHE_ALIAS].clear()
+
+    # @unittest.skip("demonstrating skipping")
+    def test_lookups_are_served_from_cache(self):
+        product = MyProduct.objects.create(name="Cached Product", unique_code="SKU001")
+        with self.assertNumQueries(1):
+            self.assertEqual(get_product_by_unique_code("SKU001"), product)
+            self.assertEqual(get_product_by_unique_code("SKU001"), product)
+        with self.assertNumQueries(1):
+            self.assertEqual(get_product_by_slug("cached-product"), product)
+            self.assertEqual(get_product_by_slug("cached-product"), product)
+
+    # @unittest.skip("demonstrating skipping")
+    def test_cache_invalidated_on_save_and_delete(self):
+        product = MyProduct.objects.create(name="Cached Product", unique_code="SKU001")
+        get_product_by_unique_code("SKU001")
+
+        product.name = "Renamed Product"
+        product.slug = "renamed-product"
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            product.save()
+            # The entry is only dropped on commit, so a read before it can't leave the old row cached
+            self.assertEqual(get_product_by_unique_code("SKU001").name, "Cached Product")
+        self.assertEqual(len(callbacks), 1)
+        self.assertEqual(get_product_by_unique_code("SKU001").name, "Renamed Product")
+        with self.assertRaises(MyProduct.DoesNotExist):
+            get_product_by_slug("cached-product")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            product.delete()
+        with self.assertRaises(MyProduct.DoesNotExist):
+            get_product_by_unique_code("SKU001")
+
+
+class MyProductCacheReplicaTestCase(TouchedTablesTransactionTestCase):
+    # Outside a TestCase transaction, so MyProduct reads really are routed to the replica. The test databases
+    # don't include it: a query sent there fails the test.
+    def setUp(self):
+        caches[PRODUCT_CACHE_ALIAS].clear()
+
+    # @unittest.skip("demonstrating skipping")
+    @mock.patch("myapp.routers.replica_available", return_value=True)
+    def test_cache_is_filled_from_the_primary(self, _):
+        product = MyProduct.objects.create(name="Cached Product", unique_code="SKU001")
+        with replica_scope():
+            self.assertEqual(MyProduct.objects.all().db, "replica")
+            with self.assertNumQueries(2):  # one miss per lookup, both on the primary
+                self.assertEqual(get_product_by_unique_code("SKU001"), product)
+                self.assertEqual(get_product_by_slug("cached-product"), product)
+
+
+class MyHomePageCacheTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    # @unittest.skip("demonstrating skipping")
+    def test_home_page_is_rendered_once_per_user(self):
+        with self.assertTemplateUsed("myapp/home.html"):
+            self.client.get(reverse("home"))
+        with self.assertTemplateNotUsed("myapp/home.html"):
+            response = self.client.get(reverse("home"))
+        self.assertContains(response, "Current user(request.user): AnonymousUser")
+
+    # @unittest.skip("demonstrating skipping")
+    def test_login_and_logout_invalidate_home_page(self):
+        User.objects.create_user(username="test", password="test")
+        cache.set(home_cache_key(User.objects.get(username="test")), "stale page")
+
+        self.client.post(reverse("login"), {"username": "test", "password": "test"})
+        self.assertContains(self.client.get(reverse("home")), "Current user(request.user): test")
+
+        cache.set(home_cache_key(User.objects.get(username="test")), "stale page")
+        self.client.get(reverse("logout"))
+        self.assertIsNone(cache.get(home_cache_key(User.objects.get(username="test"))))
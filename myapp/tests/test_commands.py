@@ -0,0 +1,213 @@
+from django.test import TestCase
+from django.contrib.sessions.models import Session
+from django.core.management import call_command
+
+from django.db import connection
+from myapp.models import ArchiveCheckpoint, MyModel, MyModelArchive, MyProduct
+from myapp.search import FTS_TABLE, search_mymodels
+from myapp.tests.touched_tables import TouchedTablesTransactionTestCase
+from myapp.management.commands.create_objs_w_faker import bounded_map
+from myapp.management.commands.bench import Command as BenchCommand, summarize
+from django.core.management.base import CommandError
+from django.utils import timezone
+from datetime import timedelta
+import json
+import os
+import tempfile
+import time
+from io import StringIO
+from unittest import mock
+from concurrent.futures import Future
+
+
+class MyManagementCommandTestCase(TestCase):
+    # @unittest.skip("demonstrating skipping")
+    def test_export_ndjson_command(self):
+        MyModel.objects.create(name="test")
+        out = StringIO()
+        call_command("export_ndjson", "mymodels", stdout=out)
+        lines = out.getvalue().splitlines()
+        self.assertEqual(len(lines), 1)
+        self.assertEqual(json.loads(lines[0])["name"], "test")
+
+    # @unittest.skip("demonstrating skipping")
+    def test_import_products_upsert(self):
+        MyProduct.objects.create(name="Old Name", unique_code="SKU001")
+        lines = [
+            '{"unique_code": "SKU001", "name": "New Name"}',
+            '{"unique_code": "SKU003", "name": "New Name"}',
+            '{"unique_code": "SKU002", "name": "Product 2"}',
+            "this is not json",
+            '{"name": "No Code"}',
+            '{"unique_code": null, "name": null}',
+            '{"unique_code": "SKU002", "name": "Product 2 again"}',
+        ]
+        with tempfile.NamedTemporaryFile("w", suffix=".jsonl", delete=False) as file:
+            file.write("\n".join(lines))
+        self.addCleanup(os.remove, file.name)
+
+        out = StringIO()
+        call_command("import_products", file.name, "--batch-size", "2", stdout=out, stderr=StringIO())
+
+        self.assertEqual(MyProduct.objects.count(), 3)
+        self.assertEqual(MyProduct.objects.get(unique_code="SKU001").name, "New Name")
+        self.assertEqual(MyProduct.objects.get(unique_code="SKU001").slug, "old-name")
+        self.assertEqual(MyProduct.objects.get(unique_code="SKU002").name, "Product 2 again")
+        # Only new codes get a slug, the upserted SKU001 in the same batch didn't use up "new-name"
+        self.assertEqual(MyProduct.objects.get(unique_code="SKU003").slug, "new-name")
+        self.assertIn("1 duplicate codes, 3 bad lines", out.getvalue())
+
+    # @unittest.skip("demonstrating skipping")
+    def test_clear_expired_sessions_in_batches(self):
+        now = timezone.now()
+        Session.objects.bulk_create(
+            [Session(session_key=f"expired{i}", session_data="", expire_date=now - timedelta(days=1)) for i in range(5)]
+            + [Session(session_key="active", session_data="", expire_date=now + timedelta(days=1))]
+        )
+        out = StringIO()
+        call_command("clear_expired_sessions", "--batch-size", "2", stdout=out)
+        self.assertEqual(list(Session.objects.values_list("session_key", flat=True)), ["active"])
+        self.assertIn("Deleted 5 expired sessions", out.getvalue())
+
+    # @unittest.skip("demonstrating skipping")
+    def test_bench_summary(self):
+        # The bench command itself builds its own test database, so only its statistics are tested here
+        summary = summarize([0.001 * i for i in range(1, 101)])
+        self.assertEqual(summary["ops"], 100)
+        self.assertEqual(summary["p50_ms"], 50.0)
+        self.assertEqual(summary["p99_ms"], 99.0)
+        self.assertEqual(summary["max_ms"], 100.0)
+
+    # @unittest.skip("demonstrating skipping")
+    def test_bench_compare_against_baseline(self):
+        baseline = {
+            "view.home": {"p50_ms": 1.0},
+            "view.login.get": {"p50_ms": 1.0},
+            "sqlite.concurrent.pragmas": {"ops_per_sec": 100.0, "read": {"p50_ms": 2.0}, "write": {"p50_ms": 4.0}},
+        }
+        stderr = StringIO()
+        command = BenchCommand(stdout=StringIO(), stderr=stderr)
+        # Within the tolerance, and a benchmark missing from the baseline is skipped
+        command.compare(
+            {
+                "view.home": {"p50_ms": 1.15},
+                "view.login.get": {"p50_ms": 0.8},
+                "orm.new": {"p50_ms": 1.0},
+                "sqlite.concurrent.pragmas": {"ops_per_sec": 50.0, "read": {"p50_ms": 2.0}, "write": {"p50_ms": 4.0}},
+            },
+            baseline,
+            tolerance=0.2,
+        )
+        self.assertIn("view.home: 1.0 -> 1.15 ms p50 (+15.0%)", stderr.getvalue())
+        self.assertIn("sqlite.concurrent.pragmas.write: 4.0 -> 4.0 ms p50 (+0.0%)", stderr.getvalue())
+        self.assertNotIn("orm.new", stderr.getvalue())
+
+        with self.assertRaisesMessage(CommandError, "1 benchmark(s) regressed by more than 20%"):
+            command.compare({"view.home": {"p50_ms": 1.25}, "view.login.get": {"p50_ms": 1.0}}, baseline, 0.2)
+
+    # @unittest.skip("demonstrating skipping")
+    def test_bench_identical_runs_pass(self):
+        # Two runs of the same code, with warm-up and the median of the repeated runs, stay within the tolerance
+        command = BenchCommand(stdout=StringIO(), stderr=StringIO())
+        command.warmup, command.repeat = 2, 3
+        sleep = lambda i: time.sleep(0.002)
+        baseline = {"sleep": command.timed(20, sleep)}
+        command.compare({"sleep": command.timed(20, sleep)}, baseline, 0.5)
+        self.assertEqual(baseline["sleep"]["ops"], 20)
+
+    # @unittest.skip("demonstrating skipping")
+    def test_bounded_map_keeps_a_window_of_batches_in_flight(self):
+        submitted = []
+
+        class Executor:
+            def submit(self, func, *args):
+                submitted.append(args)
+                future = Future()
+                future.set_result(func(*args))
+                return future
+
+        results = bounded_map(Executor(), pow, range(10), [2] * 10, window=3)
+        self.assertEqual(next(results), 0)
+        self.assertEqual(len(submitted), 3)  # map() would have submitted all 10
+        self.assertEqual(list(results), [i ** 2 for i in range(1, 10)])
+        self.assertEqual(len(submitted), 10)
+
+    # @unittest.skip("demonstrating skipping")
+    def test_rebuild_search_index(self):
+        MyModel.objects.create(name="Apple pie")
+        with connection.cursor() as cursor:
+            cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('delete-all')")
+        self.assertEqual(search_mymodels("apple", 10), [])
+
+        out = StringIO()
+        call_command("rebuild_search_index", "--optimize", stdout=out)
+        self.assertEqual([obj.name for obj in search_mymodels("apple", 10)], ["Apple pie"])
+        self.assertIn("Rebuilt the search index for 1 MyModel objects", out.getvalue())
+
+    # @unittest.skip("demonstrating skipping")
+    def test_create_objs_bulk_mode(self):
+        out = StringIO()
+        call_command("create_objs", "--count", "25", "--batch-size", "10", stdout=out)
+        self.assertEqual(MyModel.objects.count(), 25)
+        self.assertIn("rows/sec", out.getvalue())
+        self.assertIsNotNone(MyModel.objects.first().created_at)
+
+
+class MyArchiveCommandTestCase(TestCase):
+    databases = {"default", "archive"}
+
+    def setUp(self):
+        MyModel.objects.bulk_create([MyModel(name=f"Object {i}") for i in range(8)])
+        self.ids = list(MyModel.objects.order_by("id").values_list("id", flat=True))
+        # Every other object is old
+        self.old_ids = self.ids[::2]
+        MyModel.objects.filter(id__in=self.old_ids).update(created_at=timezone.now() - timedelta(days=100))
+
+    # @unittest.skip("demonstrating skipping")
+    def test_archive_old_rows(self):
+        out = StringIO()
+        call_command("archive_mymodels", "--older-than", "30", "--batch-size", "3", stdout=out)
+        self.assertEqual(list(MyModel.objects.order_by("id").values_list("id", flat=True)), self.ids[1::2])
+        self.assertEqual(list(MyModelArchive.objects.order_by("id").values_list("id", flat=True)), self.old_ids)
+        self.assertIn("Archived 4 MyModel objects", out.getvalue())
+        self.assertIn("into default in 3 batches", out.getvalue())
+
+    # @unittest.skip("demonstrating skipping")
+    def test_archive_into_separate_database(self):
+        call_command("archive_mymodels", "--older-than", "30", "--database", "archive", stdout=StringIO())
+        self.assertEqual(MyModelArchive.objects.count(), 0)
+        self.assertEqual(
+            list(MyModelArchive.objects.using("archive").order_by("id").values_list("id", flat=True)), self.old_ids
+        )
+        self.assertEqual(MyModel.objects.count(), 4)
+
+    # @unittest.skip("demonstrating skipping")
+    def test_interrupted_run_resumes_from_checkpoint(self):
+        sleep = "myapp.management.commands.archive_mymodels.time.sleep"
+        with mock.patch(sleep, side_effect=KeyboardInterrupt), self.assertRaises(KeyboardInterrupt):
+            call_command("archive_mymodels", "--older-than", "30", "--batch-size", "3", "--sleep", "1", stdout=StringIO())
+        checkpoint = ArchiveCheckpoint.objects.get()
+        self.assertEqual(checkpoint.last_id, self.ids[2])
+        self.assertEqual(MyModelArchive.objects.count(), 2)
+
+        out = StringIO()
+        # A new --older-than doesn't matter, the interrupted run is finished with its own cutoff
+        call_command("archive_mymodels", "--older-than", "0", "--batch-size", "3", stdout=out)
+        self.assertIn(f"after id {self.ids[2]}", out.getvalue())
+        self.assertEqual(list(MyModelArchive.objects.order_by("id").values_list("id", flat=True)), self.old_ids)
+        self.assertEqual(MyModel.objects.count(), 4)
+
+
+class MyManagementCommandTransactionTestCase(TouchedTablesTransactionTestCase):
+    # @unittest.skip("demonstrating skipping")
+    def test_create_objs_w_faker_parallel_mode_is_deterministic(self):
+        # TransactionTestCase because the command closes the connection before starting the worker processes
+        call_command("create_objs_w_faker", "--count", "30", "--batch-size", "7", "--workers", "2", "--seed", "42", stdout=StringIO())
+        first_run = list(MyModel.objects.order_by("id").values_list("name", "description"))
+        MyModel.objects.all().delete()
+
+        call_command("create_objs_w_faker", "--count", "30", "--batch-size", "7", "--workers", "3", "--seed", "42", stdout=StringIO())
+        second_run = list(MyModel.objects.order_by("id").values_list("name", "description"))
+
+        self.assertEqual(len(first_run), 30)
+        self.assertEqual(first_run, second_run, "Same seed should generate the same rows for any worker count")
@@ -0,0 +1,111 @@
+from django.test import TestCase
+from django.contrib.auth.models import User
+from django.core.management import call_command
+
+from myapp.models import MyModel
+
+
+class MyFixtureTestCase(TestCase):
+    fixtures = [
+        "myapp/tests/fixtures/my_fixture.json",
+    ]  # it simply calls the manage.py loaddata command with the given fixture file
+
+    # @unittest.skip("demonstrating skipping")
+    def test_fixture_loaded(self):
+        self.assertEqual(MyModel.objects.count(), 1)
+
+    # @unittest.skip("demonstrating skipping")
+    def test_a(self):
+        count = MyModel.objects.count()
+        print("### count: ", count)
+        self.assertEqual(count, 1)
+        MyModel.objects.all().delete()
+        self.assertEqual(MyModel.objects.count(), 0)
+
+    # @unittest.skip("demonstrating skipping")
+    def test_try_to_delete_loaded_fixture_forever(self):
+        count = MyModel.objects.count()
+        print("### count: ", count)
+        self.assertEqual(count, 1)
+        MyModel.objects.all().delete()
+        self.assertEqual(MyModel.objects.count(), 0)
+
+    # @unittest.skip("demonstrating skipping")
+    def test_if_fixture_deleted(self):
+        # the fixture is loaded again before each test so the previous test does not affect this test
+        # even if test_try_to_delete_loaded_fixture_forever test method is called after this test method
+        print(
+            "\n### MyModel.objects.count(): ", MyModel.objects.count(), "\n", flush=True
+        )
+        self.assertEqual(MyModel.objects.count(), 1)
+
+    # @unittest.skip("demonstrating skipping")
+    def test_load_different_fixture(self):
+        # Ensure initial fixture is loaded
+        self.assertEqual(
+            MyModel.objects.count(), 1, "Initial fixture should load 1 object."
+        )
+
+        # Load another fixture
+        call_command("loaddata", "myapp/tests/fixtures/another_fixture.json")
+
+        # Verify the total count of objects
+        self.assertEqual(
+            MyModel.objects.count(),
+            2,
+            "Loading another fixture should add one more object.",
+        )
+
+        # Verify objects from both fixtures
+        try:
+            obj_from_my_fixture = MyModel.objects.get(name="Test Object 1")
+            obj_from_another_fixture = MyModel.objects.get(
+                name="Test Object 2 - test different fixture"
+            )
+        except MyModel.DoesNotExist as e:
+            self.fail(f"Expected objects not found: {e}")
+
+        # Assert specific attributes of the objects
+        self.assertEqual(
+            obj_from_my_fixture.name,
+            "Test Object 1",
+            "First object's name does not match.",
+        )
+        self.assertEqual(
+            obj_from_another_fixture.name,
+            "Test Object 2 - test different fixture",
+            "Second object's name does not match.",
+        )
+
+    def test_try_to_delete_loaded_fixture_forever_v2(self):
+        count = MyModel.objects.count()
+        print("### count: ", count)
+        self.assertEqual(count, 1)
+        MyModel.objects.all().delete()
+        self.assertEqual(MyModel.objects.count(), 0)
+
+
+class My_setUp_and_tearDown_and_fixtures_TestCase(TestCase):
+    fixtures = [
+        "myapp/tests/fixtures/my_fixture.json",
+    ]  # it simply calls the manage.py loaddata command with the given fixture file
+
+    def setUp(self):
+        print("\n### setUp() is called\n", flush=True)
+        self.user = User.objects.create_user(username="test", password="test")
+        self.user.save()
+
+    def tearDown(self):
+        print("\n### tearDown() is called\n", flush=True)
+        # self.user.delete()
+        pass
+
+    # @unittest.skip("demonstrating skipping")
+    def test_setUp_called(self):
+        print("### test_setUp_called() is called\n", flush=True)
+        self.assertEqual(User.objects.count(), 1)
+
+    # @unittest.skip("demonstrating skipping")
+    def test_fixture_loaded(self):
+        print("### test_fixture_loaded() is called\n", flush=True)
+        self.assertEqual(MyModel.objects.count(), 1)
@@ -0,0 +1,141 @@
+from django.contrib.auth.models import User
+from django.core.management import call_command
+
+from myapp.models import MyModel, MyProduct
+from myapp.tests.snapshots import FixtureSnapshotTransactionTestCase, get_snapshot, restore_snapshot
+import json
+import os
+import tempfile
+
+
+class MyFixtureTransactionTestCase(FixtureSnapshotTransactionTestCase):
+    fixtures = [
+        "myapp/tests/fixtures/my_fixture.json",
+    ]  # deserialized once per process and bulk inserted before each test (see myapp/tests/snapshots.py)
+
+    # @unittest.skip("demonstrating skipping")
+    def test_fixture_loaded(self):
+        self.assertEqual(MyModel.objects.count(), 1)
+
+    # @unittest.skip("demonstrating skipping")
+    def test_fixture_snapshot_matches_loaddata(self):
+        snapshot_rows = list(MyModel.objects.values())
+        MyModel.objects.all().delete()
+        call_command("loaddata", "myapp/tests/fixtures/my_fixture.json", verbosity=0)
+        self.assertEqual(snapshot_rows, list(MyModel.objects.values()))
+        self.assertIsNotNone(get_snapshot("myapp/tests/fixtures/my_fixture.json"))
+
+    # @unittest.skip("demonstrating skipping")
+    def test_models_with_save_receivers_go_through_loaddata(self):
+        # loaddata sends pre_save with raw=True, so signals.generate_slug fills the missing slug
+        with tempfile.NamedTemporaryFile("w", suffix=".json", delete=False) as file:
+            json.dump([{"model": "myapp.myproduct", "pk": 1, "fields": {"name": "Fixture Product", "unique_code": "SKU001"}}], file)
+        self.addCleanup(os.remove, file.name)
+
+        self.assertIsNone(get_snapshot(file.name))
+        restore_snapshot(file.name, "default")
+        self.assertEqual(MyProduct.objects.get(pk=1).slug, "fixture-product")
+
+    # @unittest.skip("demonstrating skipping")
+    def test_if_fixture_deleted(self):
+        # the fixture is loaded again before each test so the previous test does not affect this test
+        # even if test_try_to_delete_loaded_fixture_forever test method is called after this test method
+        print(
+            "\n### MyModel.objects.count(): ", MyModel.objects.count(), "\n", flush=True
+        )
+        self.assertEqual(MyModel.objects.count(), 1)
+
+    # @unittest.skip("demonstrating skipping")
+    def test_load_different_fixture(self):
+        # Ensure initial fixture is loaded
+        self.assertEqual(
+            MyModel.objects.count(), 1, "Initial fixture should load 1 object."
+        )
+
+        # Load another fixture
+        call_command("loaddata", "myapp/tests/fixtures/another_fixture.json")
+
+        # Verify the total count of objects
+        self.assertEqual(
+            MyModel.objects.count(),
+            2,
+            "Loading another fixture should add one more object.",
+        )
+
+        # Verify objects from both fixtures
+        try:
+            obj_from_my_fixture = MyModel.objects.get(name="Test Object 1")
+            obj_from_another_fixture = MyModel.objects.get(
+                name="Test Object 2 - test different fixture"
+            )
+        except MyModel.DoesNotExist as e:
+            self.fail(f"Expected objects not found: {e}")
+
+        # Assert specific attributes of the objects
+        self.assertEqual(
+            obj_from_my_fixture.name,
+            "Test Object 1",
+            "First object's name does not match.",
+        )
+        self.assertEqual(
+            obj_from_another_fixture.name,
+            "Test Object 2 - test different fixture",
+            "Second object's name does not match.",
+        )
+
+
+# Same fixture as MyFixtureTransactionTestCase. Split in two so `manage.py test --parallel` can run the halves
+# (every test flushes the database and reloads the fixture) on different workers.
+class MyFixtureDeleteTransactionTestCase(FixtureSnapshotTransactionTestCase):
+    fixtures = [
+        "myapp/tests/fixtures/my_fixture.json",
+    ]  # deserialized once per process and bulk inserted before each test (see myapp/tests/snapshots.py)
+
+    # @unittest.skip("demonstrating skipping")
+    def test_a(self):
+        count = MyModel.objects.count()
+        print("### count: ", count)
+        self.assertEqual(count, 1)
+        MyModel.objects.all().delete()
+        self.assertEqual(MyModel.objects.count(), 0)
+
+    # @unittest.skip("demonstrating skipping")
+    def test_try_to_delete_loaded_fixture_forever(self):
+        count = MyModel.objects.count()
+        print("### count: ", count)
+        self.assertEqual(count, 1)
+        MyModel.objects.all().delete()
+        self.assertEqual(MyModel.objects.count(), 0)
+
+    def test_try_to_delete_loaded_fixture_forever_v2(self):
+        count = MyModel.objects.count()
+        print("### count: ", count)
+        self.assertEqual(count, 1)
+        MyModel.objects.all().delete()
+        self.assertEqual(MyModel.objects.count(), 0)
+
+
+class My_setUp_and_tearDown_and_fixtures_TransactionTestCase(FixtureSnapshotTransactionTestCase):
+    fixtures = [
+        "myapp/tests/fixtures/my_fixture.json",
+    ]  # deserialized once per process and bulk inserted before each test (see myapp/tests/snapshots.py)
+
+    def setUp(self):
+        print("\n### setUp() is called\n", flush=True)
+        self.user = User.objects.create_user(username="test", password="test")
+        self.user.save()
+
+    def tearDown(self):
+        print("\n### tearDown() is called\n", flush=True)
+        # self.user.delete()
+        pass
+
+    # @unittest.skip("demonstrating skipping")
+    def test_setUp_called(self):
+        print("### test_setUp_called() is called\n", flush=True)
+        self.assertEqual(User.objects.count(), 1)
+
+    # @unittest.skip("demonstrating skipping")
+    def test_fixture_loaded(self):
+        print("### test_fixture_loaded() is called\n", flush=True)
+        self.assertEqual(MyModel.objects.count(), 1)
@@ -0,0 +1,87 @@
+from django.urls import reverse
+from django.contrib.auth.models import User
+from django.test import SimpleTestCase
+
+from myapp.tests.browsers import BrowserPool, PooledBrowserTestCase
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.common.by import By
+from unittest import mock
+import time
+
+
+class MyFunctionalTestCase(PooledBrowserTestCase):
+    # self.browser comes from the shared pool (myapp/tests/browsers.py) instead of a new Chrome per test
+    # @unittest.skip("demonstrating skipping")
+    def test_home_page(self):
+        self.browser.get(self.live_server_url + reverse("home"))
+        time.sleep(3)
+        self.assertIn("Welcome to my app", self.browser.page_source)
+
+    # @unittest.skip("demonstrating skipping")
+    def test_login_page(self):
+        self.browser.get(self.live_server_url + reverse("login"))
+        time.sleep(3)
+        self.assertIn("Login", self.browser.page_source)
+
+    # @unittest.skip("demonstrating skipping")
+    def test_login(self):
+        # Create a user
+        User.objects.create_user(username="test", password="test")
+        self.assertEqual(User.objects.count(), 1)  # check if user is created
+
+        self.browser.get(self.live_server_url + reverse("login"))
+        time.sleep(3)
+        # Interact with the login form
+        self.browser.find_element(By.NAME, "username").send_keys("test")
+        self.browser.find_element(By.NAME, "password").send_keys("test")
+        self.browser.find_element(By.NAME, "submit").click()
+        time.sleep(3)
+
+        # Check if the user is redirected to the home page
+        self.assertEqual(
+            self.browser.current_url, self.live_server_url + reverse("home")
+        )
+        # Check if the user is logged in and the username is displayed
+        self.assertIn("Current user(request.user): test", self.browser.page_source)
+
+
+class MyBrowserPoolTestCase(SimpleTestCase):
+    """
+    The pool itself, with mock browsers instead of Chrome.
+    """
+
+    def make_browser(self):
+        browser = mock.Mock(current_url="http://localhost:8081/")
+        self.started.append(browser)
+        return browser
+
+    def setUp(self):
+        self.started = []
+        self.pool = BrowserPool(self.make_browser, size=2)
+        self.addCleanup(self.pool.close)
+
+    # @unittest.skip("demonstrating skipping")
+    def test_browsers_are_reused_and_reset(self):
+        with self.pool.browser() as first:
+            pass
+        with self.pool.browser() as second:
+            pass
+        self.assertIs(first, second)
+        self.assertEqual(len(self.started), 1)
+        first.delete_all_cookies.assert_called()
+        first.execute_script.assert_called_with("window.localStorage.clear(); window.sessionStorage.clear();")
+        first.get.assert_called_with("about:blank")
+
+    # @unittest.skip("demonstrating skipping")
+    def test_concurrent_tests_get_their_own_browser(self):
+        with self.pool.browser() as first, self.pool.browser() as second:
+            self.assertIsNot(first, second)
+        self.assertEqual(len(self.started), 2)
+
+    # @unittest.skip("demonstrating skipping")
+    def test_broken_browser_is_replaced(self):
+        with self.pool.browser() as first:
+            first.get.side_effect = WebDriverException("session deleted")
+        first.quit.assert_called_once()
+        with self.pool.browser() as second:
+            self.assertIsNot(first, second)
@@ -0,0 +1,202 @@
+from django.test import TestCase, override_settings, tag
+from django.urls import reverse
+from django.contrib.auth.models import User
+from django.http import HttpRequest
+from django.contrib.sessions.models import Session
+from django.contrib.sessions.middleware import SessionMiddleware
+from django.db import connection
+from asgiref.sync import async_to_sync
+
+from myapp.views import login_view
+from myapp.models import MyModel
+from myapp.sqlite import apply_pragmas
+import unittest
+import os
+import sqlite3
+import tempfile
+import time
+
+
+print(
+    "### connection.vendor: ", connection.vendor
+)  # Outputs 'sqlite', 'postgresql', 'mysql', etc.
+
+
+class MyGeneralTestCase(TestCase):
+
+    # region Client() vs HttpRequest()
+    # ==============================================================================================================
+    # ==============================================================================================================
+    @unittest.skip("demonstrating skipping")
+    def test_authenticate_with_credentials_using_client(self):
+        user = User.objects.create_user(username="test", password="test")
+        user.save()
+        self.assertEqual(User.objects.count(), 1)  # check if user is created
+
+        self.client.login(username="test", password="test")
+        self.assertTrue(user.is_authenticated)  # check if user is authenticated
+
+        response = self.client.get(reverse("home"))
+        # region Debugging
+        print("### Context Data: ", response.context)
+        print("### response, ", response)
+        print("### response.content, ", response.content.decode("utf-8"))
+        # endregion
+
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "Current user(request.user): test")
+
+    """
+        This is why we prefer Client over HttpRequest. Because HttpRequest does not have session support by default.
+    """
+
+    @unittest.skip("demonstrating skipping")
+    def test_authenticate_with_credentials_using_http_request(self):
+        user = User.objects.create_user(username="test", password="test")
+        user.save()
+        self.assertEqual(User.objects.count(), 1)  # check if user is created
+
+        # Create a simulated HttpRequest
+        request = HttpRequest()
+        request.method = "POST"
+        request.POST["username"] = "test"
+        request.POST["password"] = "test"
+
+        # Add session support to the request
+        middleware = SessionMiddleware(lambda x: x)  # No-op get_response function
+        middleware.process_request(request)
+        print("### 1- session_count: ", Session.objects.count())
+        request.session.save()
+        print("### 2- session_count: ", Session.objects.count())
+
+        # Call your custom login view
+        response = async_to_sync(login_view)(request)  # login_view is an async view
+
+        # region Debugging
+        print("### response, ", response)
+        print("### request.session, ", request.session)
+        # endregion
+
+        # Assert the response is a redirect to 'home' upon successful login
+        self.assertEqual(
+            response.status_code, 302, "Login view should redirect to 'home'"
+        )
+        self.assertEqual(
+            response.url,
+            reverse("home"),
+            "Login view should redirect to the correct 'home' URL",
+        )
+        # region check Session objects
+        session_key = request.session.session_key
+        try:
+            session = Session.objects.get(session_key=session_key)
+            self.assertIsNotNone(session, "Session should be created")
+        except Session.DoesNotExist:
+            self.fail(f"Session with key {session_key} was not found in the database.")
+        session_user_id = request.session.get("_auth_user_id")
+        self.assertIsNotNone(session_user_id, "Session should contain '_auth_user_id'")
+        self.assertEqual(
+            int(session_user_id),
+            user.id,
+            "Logged-in user ID should match the authenticated user",
+        )
+
+        print("### 3- session_count: ", Session.objects.count())
+        print("### session: ", session)
+        print("### session_key: ", session_key)
+        print("### session_user_id: ", session_user_id)
+        # endregion
+
+    # ==============================================================================================================
+    # ==============================================================================================================
+    # endregion Client() vs HttpRequest()
+
+    # region Testing Views
+    # ==============================================================================================================
+    # ==============================================================================================================
+    @unittest.skip("demonstrating skipping")
+    def test_home(self):
+        response = self.client.get(reverse("home"))
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "Welcome to my app")
+
+    # ==============================================================================================================
+    # ==============================================================================================================
+    # endregion Testing Views
+
+    # region Testing Models
+    # ==============================================================================================================
+    # ==============================================================================================================
+    # @unittest.skip("demonstrating skipping")
+    def test_create_model(self):
+        MyModel.objects.create(name="test")
+        self.assertEqual(MyModel.objects.count(), 1)
+
+    # ==============================================================================================================
+    # ==============================================================================================================
+    # endregion Testing Models
+
+
+# The slow tests live in their own small classes: `manage.py test --parallel` hands whole classes to the
+# workers, so two 5 second tests in one class would always run back to back on the same worker.
+class MyDecoratorsTestCase(TestCase):
+
+    # region Decorators
+    # ==============================================================================================================
+    # ==============================================================================================================
+    @unittest.skip("demonstrating skipping")
+    def test_skip_decorator(self):
+        self.assertEqual(1, 1)
+
+    @unittest.skip("demonstrating skipping")
+    @tag("fast")
+    def test_fast(self):
+        self.assertEqual(1, 1)
+
+    # @unittest.skip("demonstrating skipping")
+    @tag("slow")
+    def test_slow(self):
+        print("### Sleeping for 5 seconds(demonstrating slow test)")
+        time.sleep(5)
+        print("### Slept for 5 seconds")
+        self.assertEqual(1, 1)
+
+    # ==============================================================================================================
+    # ==============================================================================================================
+    # endregion Decorators
+
+
+class MyMultipleTagsTestCase(TestCase):
+    # @unittest.skip("demonstrating skipping")
+    @tag("slow", "api")
+    def test_multiple_tags(self):
+        print("### Sleeping for 5 seconds(demonstrating slow test)")
+        time.sleep(5)
+        print("### Slept for 5 seconds")
+        self.assertEqual(1, 1)
+
+
+@unittest.skipUnless(connection.vendor == "sqlite", "SQLite pragmas")
+class MySQLitePragmasTestCase(TestCase):
+    # @unittest.skip("demonstrating skipping")
+    @override_settings(SQLITE_PRAGMAS={"busy_timeout": 1234, "synchronous": "NORMAL"})
+    def test_pragmas_applied_to_new_connections(self):
+        # The pragmas are applied on connection_created, so check them on a fresh connection
+        new_connection = connection.copy()
+        try:
+            with new_connection.cursor() as cursor:
+                self.assertEqual(cursor.execute("PRAGMA busy_timeout").fetchone()[0], 1234)
+                self.assertEqual(cursor.execute("PRAGMA synchronous").fetchone()[0], 1)  # 1 is NORMAL
+        finally:
+            new_connection.close()
+
+    # @unittest.skip("demonstrating skipping")
+    def test_wal_on_file_database(self):
+        # The test database is in memory (journal_mode is always "memory" there), so WAL is checked on a file
+        with tempfile.TemporaryDirectory() as directory:
+            conn = sqlite3.connect(os.path.join(directory, "wal.sqlite3"))
+            try:
+                apply_pragmas(conn.cursor(), {"journal_mode": "WAL"})
+                self.assertEqual(conn.execute("PRAGMA journal_mode").fetchone()[0], "wal")
+            finally:
+                conn.close()
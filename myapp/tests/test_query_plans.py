@@ -0,0 +1,72 @@
+from django.test import TestCase
+from django.db import connection
+from django.db.models import Q
+from django.utils import timezone
+
+from myapp.admin import keyset_after
+from myapp.models import MyModel, MyProduct
+from myapp.views import mymodel_keyset_queryset
+import unittest
+
+
+@unittest.skipUnless(connection.vendor == "sqlite", "EXPLAIN QUERY PLAN output is SQLite specific")
+class MyQueryPlanTestCase(TestCase):
+    """
+    Runs EXPLAIN QUERY PLAN on the app's key queries and fails when one of them falls back to a full table SCAN
+    (or to sorting the whole table). An index scan ("SCAN ... USING INDEX") is fine, a plain "SCAN table" is not.
+    """
+
+    def explain(self, queryset):
+        sql, params = queryset.query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute("EXPLAIN QUERY PLAN " + sql, params)
+            return [row[-1] for row in cursor.fetchall()]
+
+    def assertNoFullScan(self, queryset):
+        plan = self.explain(queryset)
+        for detail in plan:
+            if detail.startswith("SCAN") and "USING" not in detail:
+                self.fail(f"Query does a full table scan: {detail}\nplan: {plan}\nsql: {queryset.query}")
+            if "TEMP B-TREE" in detail:
+                self.fail(f"Query sorts without an index: {detail}\nplan: {plan}\nsql: {queryset.query}")
+
+    # region MyModel
+    def test_mymodel_latest_listing(self):
+        self.assertNoFullScan(MyModel.objects.order_by("created_at", "id")[:20])
+        self.assertNoFullScan(MyModel.objects.order_by("-created_at", "-id")[:20])
+
+    def test_mymodel_keyset_page(self):
+        self.assertNoFullScan(mymodel_keyset_queryset((timezone.now(), 1))[:20])
+
+    def test_mymodel_admin_keyset_page(self):
+        # Same shape as the admin changelist's "Next" pages
+        after = keyset_after(("created_at", "id"), (timezone.now(), 1))
+        self.assertNoFullScan(MyModel.objects.filter(after).order_by("-created_at", "-id")[:100])
+
+    def test_mymodel_created_at_range(self):
+        self.assertNoFullScan(MyModel.objects.filter(created_at__gte=timezone.now()))
+
+    def test_mymodel_archive_batch(self):
+        # Same shape as one batch of the archive_mymodels command
+        self.assertNoFullScan(MyModel.objects.filter(id__gt=1000, id__lte=2000, created_at__lt=timezone.now()))
+        # MAX(id) of the old rows, read from the (created_at, id) index
+        self.assertNoFullScan(MyModel.objects.filter(created_at__lt=timezone.now()).values("id"))
+
+    def test_mymodel_name_lookup(self):
+        self.assertNoFullScan(MyModel.objects.filter(name="Test Object 1"))
+    # endregion
+
+    # region MyProduct
+    def test_myproduct_slug_lookup(self):
+        self.assertNoFullScan(MyProduct.objects.filter(slug="test-product"))
+
+    def test_myproduct_unique_code_lookup(self):
+        self.assertNoFullScan(MyProduct.objects.filter(unique_code="SKU001"))
+
+    def test_myproduct_slug_allocator_prefix_query(self):
+        # Same shape as the query myapp.slugs.SlugAllocator runs per batch
+        base = "test-product"
+        self.assertNoFullScan(
+            MyProduct.objects.filter(Q(slug=base) | Q(slug__gt=f"{base}-", slug__lt=f"{base}."))
+        )
+    # endregion
@@ -0,0 +1,115 @@
+from django.test import SimpleTestCase, TestCase, RequestFactory
+from django.http import HttpResponse
+from django.contrib.auth.models import User
+from django.contrib.sessions.models import Session
+
+from myapp.models import MyModel, MyProduct
+from myapp.middleware import ReplicaPinningMiddleware
+from myapp.routers import (
+    PrimaryReplicaRouter, forget_replica_check, replica_available, replica_in_sync, replica_scope,
+)
+from django.db import connections
+from django.db.backends.sqlite3.base import DatabaseWrapper
+from unittest import mock
+import unittest
+import os
+import tempfile
+
+
+# Under test the replica is a mirror of the primary and the router never uses it, so these tests pretend it is a
+# separate database. Only the routing decisions are checked, no query is sent to the replica.
+@mock.patch("myapp.routers.replica_available", return_value=True)
+class MyRouterTestCase(SimpleTestCase):
+    # @unittest.skip("demonstrating skipping")
+    def test_reads_go_to_replica_until_a_write(self, _):
+        with replica_scope():
+            self.assertEqual(MyModel.objects.all().db, "replica")
+            self.assertEqual(MyProduct.objects.all().db, "replica")
+            self.assertEqual(User.objects.all().db, "default")
+            self.assertEqual(Session.objects.all().db, "default")
+
+            self.assertEqual(PrimaryReplicaRouter().db_for_write(MyModel), "default")
+            self.assertEqual(MyModel.objects.all().db, "default")
+            self.assertEqual(MyProduct.objects.all().db, "default")
+
+    # @unittest.skip("demonstrating skipping")
+    def test_middleware_pins_one_request_only(self, _):
+        seen = []
+
+        def view(request):
+            seen.append(MyModel.objects.all().db)
+            PrimaryReplicaRouter().db_for_write(MyModel)
+            seen.append(MyModel.objects.all().db)
+            return HttpResponse()
+
+        middleware = ReplicaPinningMiddleware(view)
+        middleware(RequestFactory().get("/"))
+        middleware(RequestFactory().get("/"))
+        self.assertEqual(seen, ["replica", "default", "replica", "default"])
+
+
+class MyRouterTransactionTestCase(TestCase):
+    # @unittest.skip("demonstrating skipping")
+    def test_test_databases_never_use_the_replica(self):
+        self.assertFalse(replica_available())
+        self.assertEqual(MyModel.objects.all().db, "default")
+
+    # @unittest.skip("demonstrating skipping")
+    @mock.patch("myapp.routers.replica_available", return_value=True)
+    def test_reads_inside_a_transaction_stay_on_primary(self, _):
+        # Every TestCase test runs inside a transaction on the primary
+        with replica_scope():
+            self.assertEqual(MyModel.objects.all().db, "default")
+
+
+class MyReplicaCheckTestCase(SimpleTestCase):
+    def setUp(self):
+        forget_replica_check()
+        self.addCleanup(forget_replica_check)
+
+    def sqlite_database(self, name):
+        database = DatabaseWrapper({**connections["default"].settings_dict, "NAME": name}, alias=name)
+        self.addCleanup(database.close)
+        return database
+
+    # @unittest.skip("demonstrating skipping")
+    def test_replica_must_exist_and_have_the_primary_migrations(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        primary = self.sqlite_database(os.path.join(directory.name, "primary.sqlite3"))
+        replica_path = os.path.join(directory.name, "replica.sqlite3")
+        replica = self.sqlite_database(replica_path)
+
+        def record_applied(database, name):
+            with database.cursor() as cursor:
+                cursor.execute("CREATE TABLE IF NOT EXISTS django_migrations (app TEXT, name TEXT, applied TEXT)")
+                cursor.execute("INSERT INTO django_migrations VALUES ('myapp', %s, '')", [name])
+
+        record_applied(primary, "0001_initial")
+        # Never synced: no file, and checking doesn't create one
+        self.assertFalse(replica_in_sync(primary, replica))
+        self.assertFalse(os.path.exists(replica_path))
+
+        with replica.cursor() as cursor:
+            cursor.execute("CREATE TABLE unrelated (id INTEGER)")
+        self.assertFalse(replica_in_sync(primary, replica))
+        record_applied(replica, "0001_initial")
+        self.assertTrue(replica_in_sync(primary, replica))
+        # A migration applied to the primary after the last sync
+        record_applied(primary, "0002_more")
+        self.assertFalse(replica_in_sync(primary, replica))
+
+    # @unittest.skip("demonstrating skipping")
+    @unittest.skipUnless("replica" in connections.settings, "no replica database in these settings")
+    def test_check_result_is_cached(self):
+        with mock.patch.dict(connections["replica"].settings_dict, NAME="elsewhere.sqlite3"), \
+                mock.patch("myapp.routers.replica_in_sync", return_value=False) as in_sync:
+            self.assertFalse(replica_available())
+            self.assertEqual(MyModel.objects.all().db, "default")
+            self.assertEqual(in_sync.call_count, 1)
+
+            forget_replica_check()
+            in_sync.return_value = True
+            self.assertTrue(replica_available())
+            self.assertTrue(replica_available())
+            self.assertEqual(in_sync.call_count, 2)
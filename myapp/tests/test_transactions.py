@@ -0,0 +1,220 @@
+from django.test import TestCase
+from django.db.utils import IntegrityError
+from django.db import transaction, connection
+from django.contrib.auth.models import Permission, User
+from django.contrib.contenttypes.models import ContentType
+
+from myapp.models import MyProduct
+from myapp.slugs import slug_allocator
+from myapp.tests.touched_tables import TouchedTablesTracker, TouchedTablesTransactionTestCase
+from unittest import mock
+
+
+class Test_TestCaseBehavior(TestCase):
+    # @unittest.skip("demonstrating skipping")
+    def test_unique_unique_code_constraint(self):
+        """
+        The second create statement in this test does not raise an IntegrityError
+        because the unique constraint isn’t checked until the transaction is committed
+        (which happens after the test).
+        """
+        MyProduct.objects.create(name="Product A", unique_code="SKU001")
+        with self.assertRaises(
+            IntegrityError
+        ):  # Should not raise IntegrityError here, # WARNING but it does in sqlite!!
+            MyProduct.objects.create(name="Product B", unique_code="SKU001")
+
+    # @unittest.skip("demonstrating skipping")
+    def test_atomic_block(self):
+        # <<< Start of implicit atomic block >>> #
+        self.assertFalse(
+            transaction.get_autocommit(), "Test is not in an atomic block!"
+        )
+        MyProduct.objects.create(name="Product A", unique_code="SKU001")
+        try:
+            MyProduct.objects.create(name="Product B", unique_code="SKU001")
+        except IntegrityError:
+            if connection.needs_rollback:
+                print("Transaction is broken. Needs rollback.")
+                # connection.rollback() ## cannot rollback. This is forbidden when an 'atomic' block is active.
+            pass
+        self.assertEqual(MyProduct.objects.count(), 0)
+        # it should be 0 because the transaction is rolled back due to IntegrityError, BUT INSTEAD in sqlite...
+        # ...it throws an error. "You can't execute queries until the end of the 'atomic' block."
+        # Because the whole code is in an atomic block and it marked as broken query because of the error
+        # and cannot do queries in broken status.
+
+        # <<< End of implicit atomic block >>> #
+
+        # At the end of this test, the transaction will be rolled back
+        # The database remains unchanged
+
+    # @unittest.skip("demonstrating skipping")
+    def test_slug_generation(self):
+        """
+        Test that the signal generates a slug before saving.
+        """
+        product = MyProduct.objects.create(name="Test Product", unique_code="SKU001")
+        self.assertEqual(product.slug, "test-product")
+
+    # @unittest.skip("demonstrating skipping")
+    def test_bulk_create_slug_generation(self):
+        """
+        bulk_create skips the pre_save signal, so the MyProduct queryset fills the slugs itself.
+        """
+        MyProduct.objects.bulk_create(
+            [
+                MyProduct(name="Bulk Product A", unique_code="SKU001"),
+                MyProduct(name="Bulk Product B", unique_code="SKU002", slug="custom-slug"),
+            ]
+        )
+        self.assertEqual(
+            list(MyProduct.objects.order_by("unique_code").values_list("slug", flat=True)),
+            ["bulk-product-a", "custom-slug"],
+        )
+
+    # @unittest.skip("demonstrating skipping")
+    def test_unique_slug_allocation(self):
+        """
+        Products with the same name get numbered slugs, with one prefix query for the whole batch.
+        """
+        MyProduct.objects.create(name="Same Name", unique_code="SKU001")
+        products = [MyProduct(name="Same Name", unique_code=f"SKU00{i}") for i in range(2, 5)]
+        with self.assertNumQueries(2):  # prefix query + insert
+            MyProduct.objects.bulk_create(products)
+        self.assertEqual(
+            [product.slug for product in products],
+            ["same-name-2", "same-name-3", "same-name-4"],
+        )
+        product = MyProduct.objects.create(name="Same Name", unique_code="SKU005")
+        self.assertEqual(product.slug, "same-name-5")
+
+    # @unittest.skip("demonstrating skipping")
+    def test_slug_allocation_with_ignore_conflicts(self):
+        MyProduct.objects.create(name="Zed Thing", unique_code="Z-1")
+        MyProduct.objects.create(name="Other", unique_code="Z-2", slug="zed-thing-2")
+        MyProduct.objects.bulk_create([MyProduct(name="Zed Thing", unique_code="Z-3")], ignore_conflicts=True)
+        self.assertEqual(MyProduct.objects.get(unique_code="Z-3").slug, "zed-thing-3")
+
+
+class Test_TransactionTestCaseBehavior(TouchedTablesTransactionTestCase):
+    # @unittest.skip("demonstrating skipping")
+    def test_unique_unique_code_constraint(self):
+        MyProduct.objects.create(name="Product A", unique_code="SKU001")
+        with self.assertRaises(IntegrityError):  # Raises IntegrityError
+            MyProduct.objects.create(name="Product B", unique_code="SKU001")
+
+    # @unittest.skip("demonstrating skipping")
+    def test_no_atomic_block(self):
+        # No implicit atomic block here
+        self.assertTrue(transaction.get_autocommit(), "Test is in an atomic block!")
+
+        MyProduct.objects.create(
+            name="Product A", unique_code="SKU001"
+        )  # This will be committed immediately to the database
+        try:
+            MyProduct.objects.create(name="Product B", unique_code="SKU001")
+        except IntegrityError:
+            pass
+        self.assertEqual(
+            MyProduct.objects.count(), 1
+        )  # it should be 1 because the first query is committed
+
+        # The changes remain committed during the test
+
+    # @unittest.skip("demonstrating skipping")
+    def test_slug_generation(self):
+        """
+        Test that the signal generates a slug before saving.
+        """
+        product = MyProduct.objects.create(name="Another Product", unique_code="SKU002")
+        self.assertEqual(product.slug, "another-product")
+
+    # @unittest.skip("demonstrating skipping")
+    def test_slug_taken_behind_the_allocator(self):
+        """
+        Slugs taken by other inserts or edited by hand are read back from the table, not from a cache.
+        """
+        MyProduct.objects.create(name="Taken Slug", unique_code="SKU001")
+        MyProduct.objects.create(name="Other", unique_code="SKU002", slug="taken-slug-2")
+        edited = MyProduct.objects.create(name="Taken Slug", unique_code="SKU003", slug="something-else")
+        edited.slug = "taken-slug-3"
+        edited.save()
+        product = MyProduct.objects.create(name="Taken Slug", unique_code="SKU004")
+        self.assertEqual(product.slug, "taken-slug-4")
+        products = MyProduct.objects.bulk_create([MyProduct(name="Taken Slug", unique_code="SKU005")])
+        self.assertEqual(products[0].slug, "taken-slug-5")
+        with self.assertRaises(IntegrityError):
+            MyProduct.objects.create(name="Again", unique_code="SKU001")
+
+    # @unittest.skip("demonstrating skipping")
+    def test_slug_conflict_ignored_by_bulk_create(self):
+        """
+        INSERT OR IGNORE would drop a row whose slug is taken, the allocator notices and allocates again.
+        """
+        MyProduct.objects.create(name="Zed Thing", unique_code="Z-1")
+        MyProduct.objects.create(name="Other", unique_code="Z-2", slug="zed-thing-2")
+        allocate = slug_allocator.allocate
+        calls = []
+
+        def stale_allocate(products, using):
+            # The first attempt hands out a taken slug, as if another connection had just inserted it
+            calls.append(products)
+            if len(calls) == 1:
+                for product in products:
+                    product.slug = "zed-thing-2"
+            else:
+                allocate(products, using=using)
+
+        with mock.patch.object(slug_allocator, "allocate", side_effect=stale_allocate):
+            MyProduct.objects.bulk_create([MyProduct(name="Zed Thing", unique_code="Z-3")], ignore_conflicts=True)
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(MyProduct.objects.get(unique_code="Z-3").slug, "zed-thing-3")
+        # Rows skipped for their unique_code are still ignored
+        MyProduct.objects.bulk_create([MyProduct(name="Zed Thing", unique_code="Z-1")], ignore_conflicts=True)
+        self.assertEqual(MyProduct.objects.count(), 3)
+
+
+class Test_TouchedTablesTeardown(TouchedTablesTransactionTestCase):
+    """
+    Tests run in alphabetical order: test_1 leaves rows behind, test_2 checks the teardown removed them.
+    """
+
+    # @unittest.skip("demonstrating skipping")
+    def test_1_write_rows(self):
+        MyProduct.objects.create(name="Product A", unique_code="SKU001")
+        User.objects.create(username="test")
+        self.assertEqual(
+            self._touched_tables["default"].tables, {"myapp_myproduct", "auth_user"}
+        )
+
+    # @unittest.skip("demonstrating skipping")
+    def test_2_rows_are_gone(self):
+        self.assertEqual(MyProduct.objects.count(), 0)
+
+    # @unittest.skip("demonstrating skipping")
+    def test_3_write_content_types(self):
+        ContentType.objects.filter(app_label="myapp").delete()  # cascades to their permissions
+        ContentType.objects.clear_cache()
+        self.assertIn("django_content_type", self._touched_tables["default"].tables)
+
+    # @unittest.skip("demonstrating skipping")
+    def test_4_content_types_are_back(self):
+        # test_3 fell back to the full flush, whose post_migrate creates the content types and permissions again
+        self.assertTrue(ContentType.objects.filter(app_label="myapp", model="myproduct").exists())
+        self.assertTrue(Permission.objects.filter(codename="add_myproduct").exists())
+        self.assertEqual(User.objects.count(), 0)
+
+    # @unittest.skip("demonstrating skipping")
+    def test_tracker_parses_write_statements(self):
+        tracker = TouchedTablesTracker()
+        execute = lambda sql, params, many, context: None
+        for sql in [
+            'INSERT INTO "myapp_mymodel" ("name") VALUES (%s)',
+            'UPDATE "auth_user" SET "last_login" = %s',
+            'DELETE FROM "django_session" WHERE "expire_date" < %s',
+            'SELECT * FROM "myapp_myproduct"',
+        ]:
+            tracker(execute, sql, None, False, None)
+        self.assertEqual(tracker.tables, {"myapp_mymodel", "auth_user", "django_session"})
+        self.assertFalse(tracker.flush_everything)
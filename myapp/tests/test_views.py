@@ -0,0 +1,283 @@
+from django.test import TestCase, AsyncClient
+from django.urls import reverse
+from django.contrib.auth.models import User
+from django.contrib.auth.backends import ModelBackend
+from django.contrib.auth.hashers import verify_password
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from myapp.admin import MyModelAdmin
+from myapp.models import MyModel, MyProduct
+from myapp.search import search_filter
+from myapp.tests.query_budget import QueryBudgetTestMixin
+from myapp.metrics import request_latency
+from unittest import mock
+import asyncio
+import threading
+import json
+
+
+class MyAsyncViewsTestCase(TestCase):
+    def setUp(self):
+        self.users = [User.objects.create_user(username=f"test{i}", password="test") for i in range(4)]
+
+    # @unittest.skip("demonstrating skipping")
+    async def test_concurrent_logins_do_not_serialize(self):
+        """
+        Every password check waits on a barrier until all logins are inside one. If the checks ran one at a
+        time (e.g. on the single sync_to_async thread) the barrier would time out and the logins would fail.
+        """
+        barrier = threading.Barrier(len(self.users), timeout=10)
+
+        def verify_password_together(*args, **kwargs):
+            barrier.wait()
+            return verify_password(*args, **kwargs)
+
+        async def log_in(user):
+            client = AsyncClient()  # goes through Django's ASGI handler
+            response = await client.post(reverse("login"), {"username": user.username, "password": "test"})
+            self.assertRedirects(response, reverse("home"), fetch_redirect_response=False)
+            response = await client.get(reverse("home"))
+            self.assertContains(response, f"Current user(request.user): {user.username}")
+            self.assertEqual(response["X-DB-Query-Count"], "1")  # auth_user, counted for async views too
+
+        with mock.patch("myapp.backends.verify_password", verify_password_together):
+            await asyncio.gather(*(log_in(user) for user in self.users))
+
+    # @unittest.skip("demonstrating skipping")
+    async def test_wrong_password_is_checked_once(self):
+        with mock.patch.object(ModelBackend, "authenticate") as model_backend_authenticate:
+            response = await AsyncClient().post(reverse("login"), {"username": "test0", "password": "wrong"})
+        self.assertEqual(response.status_code, 200)  # the login page again, no redirect
+        model_backend_authenticate.assert_not_called()
+
+    # @unittest.skip("demonstrating skipping")
+    def test_sessions_logged_in_by_model_backend_stay_valid(self):
+        self.client.force_login(self.users[0], backend="django.contrib.auth.backends.ModelBackend")
+        self.assertContains(self.client.get(reverse("home")), "Current user(request.user): test0")
+
+
+class MyMetricsTestCase(TestCase):
+    def setUp(self):
+        request_latency.clear()
+
+    # @unittest.skip("demonstrating skipping")
+    def test_latency_histogram_per_url_name(self):
+        self.client.get(reverse("home"))
+        self.client.get(reverse("home"))
+        self.client.get(reverse("login"))
+        self.client.get(reverse("admin:index"))
+
+        response = self.client.get(reverse("metrics"))
+        self.assertEqual(response.status_code, 200)
+        metrics = response.content.decode("utf-8")
+        self.assertIn("# TYPE myapp_request_latency_seconds histogram", metrics)
+        self.assertIn('myapp_request_latency_seconds_count{view="home"} 2', metrics)
+        self.assertIn('myapp_request_latency_seconds_bucket{view="home",le="+Inf"} 2', metrics)
+        self.assertIn('myapp_request_latency_seconds_count{view="login"} 1', metrics)
+        self.assertIn('myapp_request_latency_seconds_count{view="admin"} 1', metrics)
+
+    # @unittest.skip("demonstrating skipping")
+    def test_login_and_logout_are_logged(self):
+        User.objects.create_user(username="test", password="test")
+        with self.assertLogs("myapp.views", level="INFO") as logs:
+            self.client.post(reverse("login"), {"username": "test", "password": "wrong"})
+            self.client.post(reverse("login"), {"username": "test", "password": "test"})
+            self.client.get(reverse("logout"))
+        self.assertEqual(
+            [(record.event, record.username) for record in logs.records],
+            [("login_failed", "test"), ("login", "test"), ("logout", "test")],
+        )
+
+
+class MyQueryBudgetTestCase(QueryBudgetTestMixin, TestCase):
+    def setUp(self):
+        cache.clear()
+        MyModel.objects.create(name="test")
+        MyProduct.objects.create(name="Test Product", unique_code="SKU001")
+        User.objects.create_superuser(username="test", password="test")
+
+    # @unittest.skip("demonstrating skipping")
+    def test_anonymous_views_within_query_budget(self):
+        self.assertWithinQueryBudget(self.client.get(reverse("home")))
+        self.assertWithinQueryBudget(self.client.get(reverse("login")))
+        self.assertWithinQueryBudget(self.client.get(reverse("metrics")))
+
+    # @unittest.skip("demonstrating skipping")
+    def test_authenticated_views_within_query_budget(self):
+        self.assertWithinQueryBudget(
+            self.client.post(reverse("login"), {"username": "test", "password": "test"})
+        )
+        self.assertWithinQueryBudget(self.client.get(reverse("home")))
+        self.assertWithinQueryBudget(self.client.get(reverse("admin:index")))
+        self.assertWithinQueryBudget(self.client.get(reverse("mymodel_list")))
+        self.assertWithinQueryBudget(self.client.get(reverse("mymodel_search"), {"q": "test"}))
+        self.assertWithinQueryBudget(self.client.get(reverse("admin:myapp_mymodel_changelist")))
+        self.assertWithinQueryBudget(self.client.get(reverse("admin:myapp_myproduct_changelist")))
+        self.assertWithinQueryBudget(self.client.get(reverse("logout")))
+
+
+class MyApiTestCase(TestCase):
+    def setUp(self):
+        self.client.force_login(User.objects.create_user(username="staff", password="test", is_staff=True))
+
+    # @unittest.skip("demonstrating skipping")
+    def test_api_is_for_staff_only(self):
+        self.client.force_login(User.objects.create_user(username="test", password="test"))
+        for url in (reverse("mymodel_list"), reverse("mymodel_search"), reverse("export", args=["mymodels"])):
+            self.assertRedirects(self.client.get(url), f"{reverse('admin:login')}?next={url}")
+        self.client.logout()
+        for url in (reverse("mymodel_list"), reverse("mymodel_search"), reverse("export", args=["mymodels"])):
+            self.assertRedirects(self.client.get(url), f"{reverse('admin:login')}?next={url}")
+
+    # @unittest.skip("demonstrating skipping")
+    def test_mymodel_list_keyset_pagination(self):
+        MyModel.objects.bulk_create([MyModel(name=f"Object {i}") for i in range(5)])
+        expected_ids = list(MyModel.objects.order_by("created_at", "id").values_list("id", flat=True))
+
+        seen_ids = []
+        cursor = None
+        while True:
+            params = {"limit": 2}
+            if cursor:
+                params["cursor"] = cursor
+            response = self.client.get(reverse("mymodel_list"), params)
+            self.assertEqual(response.status_code, 200)
+            data = response.json()
+            seen_ids += [row["id"] for row in data["results"]]
+            cursor = data["next_cursor"]
+            if cursor is None:
+                break
+
+        self.assertEqual(seen_ids, expected_ids)
+
+    # @unittest.skip("demonstrating skipping")
+    def test_mymodel_list_invalid_cursor(self):
+        response = self.client.get(reverse("mymodel_list"), {"cursor": "not-a-cursor"})
+        self.assertEqual(response.status_code, 400)
+
+    # @unittest.skip("demonstrating skipping")
+    def test_export_ndjson_streaming(self):
+        MyProduct.objects.bulk_create(
+            [MyProduct(name=f"Product {i}", unique_code=f"SKU00{i}") for i in range(3)]
+        )
+        # The rows are read while the response streams, after QueryCountMiddleware returned, so the export's
+        # queries are counted here rather than with a query budget
+        with self.assertNumQueries(2):  # auth_user, the rows
+            response = self.client.get(reverse("export", args=["myproducts"]))
+            self.assertEqual(response.status_code, 200)
+            self.assertTrue(response.streaming)
+            lines = b"".join(response.streaming_content).decode("utf-8").splitlines()
+        self.assertEqual(
+            [json.loads(line)["unique_code"] for line in lines],
+            ["SKU000", "SKU001", "SKU002"],
+        )
+        self.assertEqual(self.client.get(reverse("export", args=["users"])).status_code, 404)
+
+    # @unittest.skip("demonstrating skipping")
+    async def test_export_ndjson_streams_asynchronously_under_asgi(self):
+        await MyProduct.objects.abulk_create(
+            [MyProduct(name=f"Product {i}", unique_code=f"SKU00{i}") for i in range(3)]
+        )
+        await self.async_client.aforce_login(await User.objects.aget(username="staff"))
+        response = await self.async_client.get(reverse("export", args=["myproducts"]))
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.is_async)
+        lines = b"".join([chunk async for chunk in response.streaming_content]).decode("utf-8").splitlines()
+        self.assertEqual(
+            [json.loads(line)["unique_code"] for line in lines],
+            ["SKU000", "SKU001", "SKU002"],
+        )
+
+
+class MyLargeTableAdminTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        MyModel.objects.bulk_create([MyModel(name=f"Object {i}") for i in range(7)])
+        User.objects.create_superuser(username="test", password="test")
+        self.client.force_login(User.objects.get(username="test"))
+
+    # @unittest.skip("demonstrating skipping")
+    @mock.patch.object(MyModelAdmin, "list_per_page", 3)
+    def test_keyset_navigation(self):
+        expected_ids = list(MyModel.objects.order_by("-created_at", "-id").values_list("id", flat=True))
+        url = reverse("admin:myapp_mymodel_changelist")
+
+        seen_ids = []
+        query_string = ""
+        while query_string is not None:
+            response = self.client.get(url + query_string)
+            self.assertEqual(response.status_code, 200)
+            changelist = response.context["cl"]
+            seen_ids += [obj.id for obj in changelist.result_list]
+            query_string = changelist.keyset_next_url
+
+        self.assertEqual(seen_ids, expected_ids)
+
+    # @unittest.skip("demonstrating skipping")
+    def test_changelist_does_not_count_the_table(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse("admin:myapp_mymodel_changelist"))
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.context["cl"].paginator.is_estimate)
+        self.assertEqual(response.context["cl"].result_count, 7)
+        self.assertFalse([query["sql"] for query in queries if "COUNT(" in query["sql"].upper()])
+
+    # @unittest.skip("demonstrating skipping")
+    def test_invalid_cursor(self):
+        response = self.client.get(reverse("admin:myapp_mymodel_changelist"), {"after": "not-a-cursor"})
+        self.assertRedirects(response, reverse("admin:myapp_mymodel_changelist") + "?e=1")
+
+
+class MySearchTestCase(TestCase):
+    def setUp(self):
+        MyModel.objects.create(name="Apple pie", description="A classic dessert")
+        MyModel.objects.create(name="Fruit salad", description="Bananas, apples and an apple")
+        MyModel.objects.bulk_create([MyModel(name="Carrot cake", description="No fruit at all")])
+        self.client.force_login(User.objects.create_user(username="staff", password="test", is_staff=True))
+
+    def search(self, q):
+        response = self.client.get(reverse("mymodel_search"), {"q": q})
+        self.assertEqual(response.status_code, 200)
+        return [row["name"] for row in response.json()["results"]]
+
+    # @unittest.skip("demonstrating skipping")
+    def test_ranked_search(self):
+        # A name match ranks above description matches, the last word is a prefix
+        self.assertEqual(self.search("apple"), ["Apple pie", "Fruit salad"])
+        self.assertEqual(self.search("frui"), ["Fruit salad", "Carrot cake"])
+        self.assertEqual(self.search("fruit cake"), ["Carrot cake"])
+        self.assertEqual(self.search(""), [])
+
+    # @unittest.skip("demonstrating skipping")
+    def test_fts_syntax_in_the_query_is_plain_text(self):
+        self.assertEqual(self.search('apple OR "carrot'), [])
+        self.assertEqual(self.search('pie) -"'), ["Apple pie"])
+
+    # @unittest.skip("demonstrating skipping")
+    def test_index_follows_every_write_path(self):
+        MyModel.objects.filter(name="Carrot cake").update(name="Lemon tart")
+        obj = MyModel.objects.get(name="Apple pie")
+        obj.name = "Plum pie"
+        obj.save()
+        MyModel.objects.filter(name="Fruit salad").delete()
+
+        self.assertEqual(self.search("carrot"), [])
+        self.assertEqual(self.search("lemon"), ["Lemon tart"])
+        self.assertEqual(self.search("apple"), [])
+        self.assertEqual(self.search("pie"), ["Plum pie"])
+
+    # @unittest.skip("demonstrating skipping")
+    @mock.patch("myapp.admin.search_filter", lambda text: search_filter(text, limit=1))
+    def test_admin_search_lists_the_newest_matches_only(self):
+        self.client.force_login(User.objects.create_superuser(username="test", password="test"))
+        response = self.client.get(reverse("admin:myapp_mymodel_changelist"), {"q": "apple"})
+        self.assertEqual([obj.name for obj in response.context["cl"].result_list], ["Fruit salad"])
+
+    # @unittest.skip("demonstrating skipping")
+    def test_admin_search(self):
+        self.client.force_login(User.objects.create_superuser(username="test", password="test"))
+        response = self.client.get(reverse("admin:myapp_mymodel_changelist"), {"q": "apple"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(sorted(obj.name for obj in response.context["cl"].result_list), ["Apple pie", "Fruit salad"])
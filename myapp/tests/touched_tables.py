@@ -0,0 +1,81 @@
+"""
+Touched-table teardown for TransactionTestCase.
+
+After every test TransactionTestCase runs `flush`, which empties every table (auth, sessions, admin log,
+contenttypes...) and then re-creates the content types and permissions through post_migrate, even when the
+test only wrote to myapp_myproduct. TouchedTablesTransactionTestCase watches the SQL the test runs and only
+empties the tables that were written to.
+"""
+
+import re
+
+from django.core.management.color import no_style
+from django.db import connections
+from django.test import TransactionTestCase
+
+# INSERT [OR ...] INTO / REPLACE INTO / UPDATE [OR ...] / DELETE FROM followed by the (quoted) table name
+WRITE_RE = re.compile(
+    r'^\s*(?:INSERT(?:\s+OR\s+\w+)?\s+INTO|REPLACE\s+INTO|UPDATE(?:\s+OR\s+\w+)?|DELETE\s+FROM)\s+[`"\[]?([^\s`"\]()]+)',
+    re.IGNORECASE,
+)
+# Statements after which we can't tell what changed, the test falls back to a full flush
+SCHEMA_RE = re.compile(r'^\s*(?:CREATE|DROP|ALTER|TRUNCATE)\b', re.IGNORECASE)
+# Tables whose rows the full flush creates again through post_migrate: emptied by a partial flush, they would
+# stay empty for the next tests in the process, so writing to them also falls back to a full flush
+POST_MIGRATE_TABLES = {'django_content_type', 'auth_permission'}
+
+
+class TouchedTablesTracker:
+    """
+    execute_wrapper that collects the tables written by the statements it sees.
+    """
+
+    def __init__(self):
+        self.tables = set()
+        self.flush_everything = False
+
+    def __call__(self, execute, sql, params, many, context):
+        match = WRITE_RE.match(sql)
+        if match:
+            self.tables.add(match.group(1))
+        elif SCHEMA_RE.match(sql):
+            self.flush_everything = True
+        return execute(sql, params, many, context)
+
+
+class TouchedTablesTransactionTestCase(TransactionTestCase):
+    """
+    TransactionTestCase that only empties the tables the test (including fixture loading and setUp) wrote to.
+
+    Only writes made through this thread's connections are seen: tests whose code writes from other threads
+    (e.g. a live server) must keep using TransactionTestCase. Sequences are reset when `reset_sequences` is set.
+    """
+
+    def _pre_setup(self):
+        self._touched_tables = {}
+        for db_name in self._databases_names(include_mirrors=False):
+            tracker = TouchedTablesTracker()
+            connections[db_name].execute_wrappers.append(tracker)
+            self._touched_tables[db_name] = tracker
+        super()._pre_setup()
+
+    def _fixture_teardown(self):
+        trackers = self._touched_tables
+        for db_name, tracker in trackers.items():
+            connections[db_name].execute_wrappers.remove(tracker)
+
+        if self.serialized_rollback or any(
+            tracker.flush_everything or tracker.tables & POST_MIGRATE_TABLES for tracker in trackers.values()
+        ):
+            return super()._fixture_teardown()
+
+        for db_name, tracker in trackers.items():
+            if not tracker.tables:
+                continue
+            connection = connections[db_name]
+            tables = tracker.tables & set(connection.introspection.table_names())
+            # allow_cascade also empties the tables that reference these ones, so foreign keys stay valid
+            sql_list = connection.ops.sql_flush(
+                no_style(), sorted(tables), reset_sequences=self.reset_sequences, allow_cascade=True
+            )
+            connection.ops.execute_sql_flush(sql_list)
@@ -5,4 +5,8 @@ urlpatterns = [
     path('', views.home_view, name='home'),
     path('login/', views.login_view, name='login'),
     path('logout/', views.logout_view, name='logout'),
+    path('api/mymodels/', views.mymodel_list_view, name='mymodel_list'),
+    path('api/mymodels/search/', views.mymodel_search_view, name='mymodel_search'),
+    path('api/export/<str:model_name>/', views.export_view, name='export'),
+    path('metrics', views.metrics_view, name='metrics'),
 ]
\ No newline at end of file
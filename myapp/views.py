@@ -1,16 +1,43 @@
 from django.shortcuts import render, redirect
+from django.template.loader import render_to_string
+from django.core.cache import cache
 from django.contrib.auth.models import User
-from django.http import HttpResponse
-from django.contrib.auth import authenticate, login, logout
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse, Http404
+from django.contrib.auth import alogin, alogout
+from django.contrib.admin.views.decorators import staff_member_required
+from django.core import signing
+from django.core.handlers.asgi import ASGIRequest
+from django.db.models import Q
+from django.views.decorators.http import require_GET
+from datetime import datetime
+import logging
+from .models import MyModel
+from .exports import EXPORT_MODELS, aiter_ndjson, iter_ndjson
+from .page_cache import HOME_CACHE_TIMEOUT, home_cache_key
+from .backends import aauthenticate
+from .metrics import render_metrics
+from .search import search_mymodels
 
 
+logger = logging.getLogger(__name__)
+
 
 # Create your views here.
-def home_view(request):
+# home/login/logout are native async views: under ASGI (myproject/asgi.py) they run on the event loop
+# instead of taking a worker thread each, and password checks run in myapp.backends.password_executor.
+async def home_view(request):
     template_path = 'myapp/home.html'
-    return render(request, template_path)
+    # Resolve the user with the async API up front, the template would otherwise load it synchronously
+    request.user = await request.auser()
+    # The template must stay free of per-request tokens (e.g. {% csrf_token %}) while its output is cached
+    cache_key = home_cache_key(request.user)
+    content = await cache.aget(cache_key)
+    if content is None:
+        content = render_to_string(template_path, request=request)
+        await cache.aset(cache_key, content, HOME_CACHE_TIMEOUT)
+    return HttpResponse(content)
 
-def login_view(request):
+async def login_view(request):
     template_path = 'myapp/login.html'
 
     # If the request is POST, process the form
@@ -22,21 +49,109 @@ def login_view(request):
             return render(request, template_path, {'error': 'Username and password are required.'})
 
         # Authenticate user
-        user = authenticate(request, username=username, password=password)
+        user = await aauthenticate(request, username=username, password=password)
         if user:
             # Log the user in
-            login(request, user)
-            print("### User is authenticated: ", user.is_authenticated)
+            await alogin(request, user)
+            logger.info('User logged in', extra={'event': 'login', 'username': user.get_username()})
             return redirect('home')
         else:
             # Return error to template
-            print("### User is not authenticated. Invalid username or password.")
+            logger.info('Invalid username or password', extra={'event': 'login_failed', 'username': username})
             return render(request, template_path, {'error': 'Invalid username or password.'})
 
     # For GET requests, render the login page
     return render(request, template_path)
 
-def logout_view(request):
-    logout(request)
-    print("### User is logged out.")
+async def logout_view(request):
+    user = await request.auser()
+    await alogout(request)
+    logger.info('User logged out', extra={'event': 'logout', 'username': user.get_username()})
     return redirect('login')
+
+
+MYMODEL_LIST_FIELDS = ('id', 'name', 'description', 'created_at', 'updated_at')
+MYMODEL_LIST_DEFAULT_LIMIT = 50
+MYMODEL_LIST_MAX_LIMIT = 500
+MYMODEL_CURSOR_SALT = 'myapp.mymodel_list'
+
+def mymodel_keyset_queryset(after=None):
+    """
+    MyModel rows ordered by (created_at, id), starting right after the `after` (created_at, id) key.
+    The condition is written as `created_at >= x AND (created_at > x OR id > y)` so SQLite seeks into the
+    (created_at, id) index instead of walking it from the start: every page costs the same, however deep.
+    """
+    queryset = MyModel.objects.order_by('created_at', 'id')
+    if after is None:
+        return queryset
+    created_at, pk = after
+    if created_at is None:
+        # NULL created_at rows sort first in SQLite, so everything with a date comes after them
+        return queryset.filter(Q(created_at__isnull=False) | Q(id__gt=pk))
+    return queryset.filter(created_at__gte=created_at).filter(Q(created_at__gt=created_at) | Q(id__gt=pk))
+
+# The API serves the same data as the admin, so it is for staff members too
+@staff_member_required
+@require_GET
+def mymodel_list_view(request):
+    try:
+        limit = int(request.GET.get('limit', MYMODEL_LIST_DEFAULT_LIMIT))
+    except ValueError:
+        return JsonResponse({'error': 'limit must be a number.'}, status=400)
+    limit = max(1, min(limit, MYMODEL_LIST_MAX_LIMIT))
+
+    after = None
+    cursor = request.GET.get('cursor')
+    if cursor:
+        # The cursor is the signed key of the last row of the previous page
+        try:
+            created_at, pk = signing.loads(cursor, salt=MYMODEL_CURSOR_SALT)
+            after = (datetime.fromisoformat(created_at) if created_at else None, int(pk))
+        except (signing.BadSignature, TypeError, ValueError):
+            return JsonResponse({'error': 'Invalid cursor.'}, status=400)
+
+    # values() skips building model instances, one extra row tells us if there is a next page
+    rows = list(mymodel_keyset_queryset(after).values(*MYMODEL_LIST_FIELDS)[:limit + 1])
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        last_created_at = last['created_at'].isoformat() if last['created_at'] else None
+        next_cursor = signing.dumps([last_created_at, last['id']], salt=MYMODEL_CURSOR_SALT)
+
+    return JsonResponse({'results': rows, 'next_cursor': next_cursor})
+
+MYMODEL_SEARCH_DEFAULT_LIMIT = 20
+MYMODEL_SEARCH_MAX_LIMIT = 100
+
+@staff_member_required
+@require_GET
+def mymodel_search_view(request):
+    try:
+        limit = int(request.GET.get('limit', MYMODEL_SEARCH_DEFAULT_LIMIT))
+    except ValueError:
+        return JsonResponse({'error': 'limit must be a number.'}, status=400)
+    limit = max(1, min(limit, MYMODEL_SEARCH_MAX_LIMIT))
+
+    # Ranked with bm25 by the FTS5 index (myapp/search.py), best match first
+    results = [
+        {'id': obj.id, 'name': obj.name, 'created_at': obj.created_at, 'rank': obj.rank}
+        for obj in search_mymodels(request.GET.get('q', ''), limit)
+    ]
+    return JsonResponse({'results': results})
+
+@staff_member_required
+@require_GET
+def export_view(request, model_name):
+    if model_name not in EXPORT_MODELS:
+        raise Http404(f'Unknown export: {model_name}')
+    # Rows are streamed as they are read, the table is never held in memory. Each handler gets the iterator
+    # it can stream without buffering: an async one under ASGI, a sync one under WSGI.
+    rows = aiter_ndjson(model_name) if isinstance(request, ASGIRequest) else iter_ndjson(model_name)
+    response = StreamingHttpResponse(rows, content_type='application/x-ndjson')
+    response['Content-Disposition'] = f'attachment; filename="{model_name}.ndjson"'
+    return response
+
+@require_GET
+def metrics_view(request):
+    return HttpResponse(render_metrics(), content_type='text/plain; version=0.0.4; charset=utf-8')
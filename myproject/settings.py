@@ -27,6 +27,9 @@ DEBUG = True
 
 ALLOWED_HOSTS = []
 
+# Report the number of SQL queries and their total time on every response (X-DB-Query-* headers), dev only
+QUERY_COUNT_MIDDLEWARE = DEBUG
+
 
 # Application definition
 
@@ -41,6 +44,9 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'myapp.middleware.LatencyMiddleware', # First, so it times the whole middleware stack and the view
+    'myapp.middleware.QueryCountMiddleware', # Only active when QUERY_COUNT_MIDDLEWARE is True
+    'myapp.middleware.ReplicaPinningMiddleware', # Per-request read-your-writes scope for the database router
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -78,10 +84,119 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': 'mydatabase.sqlite3',  # Production database
-        'TEST': { # Add this line to use a different database for testing
-            'NAME': 'test_database.sqlite3',  # Test database
+        # No TEST NAME: the test database is an in-memory SQLite database, and `manage.py test --parallel N`
+        # gives every worker its own in-memory clone instead of sharing one test_database.sqlite3 file.
+        # Set 'TEST': {'NAME': 'test_database.sqlite3'} to keep the test database on disk (e.g. for --keepdb).
+        'CONN_MAX_AGE': 600,  # Keep connections open between requests (and the pragmas below applied once)
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': {
+            # Take the write lock when a transaction starts instead of failing with "database is locked"
+            # when a read transaction later tries to upgrade to a write
+            'transaction_mode': 'IMMEDIATE',
+        },
+    },
+    # Read-only copy of the primary for MyModel/MyProduct reads, refreshed with `python manage.py sync_replica`
+    # (e.g. from cron or with --interval). Until the first sync, and whenever it misses a migration applied to
+    # the primary, the router reads from the primary (myapp.routers.replica_available)
+    'replica': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': 'mydatabase.replica.sqlite3',
+        'CONN_MAX_AGE': 600,
+        'CONN_HEALTH_CHECKS': True,
+        'TEST': {
+            'MIRROR': 'default',  # Tests use the primary's test database, see myapp.routers.replica_available
+        },
+    },
+    # Separate file for old MyModel rows: `python manage.py migrate --database archive` once, then
+    # `python manage.py archive_mymodels --older-than DAYS --database archive` (only myapp_mymodelarchive lives here)
+    'archive': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': 'mydatabase.archive.sqlite3',
+    },
+}
+
+# https://docs.djangoproject.com/en/5.1/topics/db/multi-db/#automatic-database-routing
+DATABASE_ROUTERS = ['myapp.routers.PrimaryReplicaRouter']
+
+# Applied to every new SQLite connection by myapp.signals.configure_sqlite_connection (empty dict to disable)
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',  # readers don't block the writer and the writer doesn't block readers
+    'synchronous': 'NORMAL',  # with WAL: fsync on checkpoints instead of every commit, still crash safe
+    'mmap_size': 256 * 1024 * 1024,  # read pages through a 256MB memory map instead of read() calls
+    'cache_size': -64000,  # 64MB page cache per connection (negative values are KiB)
+    'busy_timeout': 5000,  # wait up to 5s for a lock instead of failing right away
+}
+
+# Cache
+# https://docs.djangoproject.com/en/5.1/topics/cache/
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'products': { # Read-through cache for MyProduct lookups (myapp/product_cache.py)
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'myapp-products',
+        'TIMEOUT': 300,
+        'OPTIONS': {
+            'MAX_ENTRIES': 10000,  # least recently used entries are evicted past this size
+            'CULL_FREQUENCY': 10,  # evict 1/10 of the entries at a time
         },
-    }
+    },
+    'sessions': { # Local stand-in for a shared cache (Redis/Memcached) backing the session engine
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'myproject-sessions',
+        'OPTIONS': {
+            'MAX_ENTRIES': 10000,
+        },
+    },
+}
+
+# Sessions
+# https://docs.djangoproject.com/en/5.1/topics/http/sessions/#using-cached-sessions
+
+# Sessions are read from the cache and written through to django_session, so authenticated requests
+# don't hit SQLite. LocMemCache is per process: with more than one worker process, point the 'sessions'
+# alias at a shared cache, otherwise a logout in one process is not seen by the others.
+SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
+SESSION_CACHE_ALIAS = 'sessions'
+
+# Authentication
+# https://docs.djangoproject.com/en/5.1/topics/auth/customizing/#specifying-authentication-backends
+
+# ModelBackend with a native async aauthenticate() that verifies passwords in a bounded thread pool.
+# ModelBackend stays listed so the sessions it logged in remain valid (a session keeps its backend's path).
+AUTHENTICATION_BACKENDS = [
+    'myapp.backends.ExecutorModelBackend',
+    'django.contrib.auth.backends.ModelBackend',
+]
+PASSWORD_HASHING_WORKERS = None  # size of that pool, None uses ThreadPoolExecutor's default (CPU count + 4, max 32)
+
+# Logging
+# https://docs.djangoproject.com/en/5.1/topics/logging/
+
+# myapp logs JSON lines through a queue, a background thread does the actual writing
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'formatters': {
+        'json': {
+            '()': 'myapp.log.JsonFormatter',
+        },
+    },
+    'handlers': {
+        'queue': {
+            'class': 'myapp.log.QueueStreamHandler',
+            'formatter': 'json',
+        },
+    },
+    'loggers': {
+        'myapp': {
+            'handlers': ['queue'],
+            'level': 'INFO',
+            'propagate': False,
+        },
+    },
 }
 
 # Password validation
@@ -0,0 +1,47 @@
+"""
+Fast settings profile for the test suite.
+
+Usage:
+    python manage.py test --settings=myproject.test_settings
+"""
+
+from .settings import *  # noqa: F401,F403
+
+# In-memory SQLite test database (cloned per worker with --parallel)
+DATABASES = {
+    'default': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': ':memory:',
+    },
+    'archive': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': ':memory:',
+    },
+}
+
+# PBKDF2 spends most of every create_user()/authenticate() call on hashing, MD5 is plenty for tests
+PASSWORD_HASHERS = [
+    'django.contrib.auth.hashers.MD5PasswordHasher',
+]
+
+CACHES = {
+    alias: {**config, 'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}
+    for alias, config in CACHES.items()
+}
+
+EMAIL_BACKEND = 'django.core.mail.backends.locmem.EmailBackend'
+
+
+class DisableMigrations:
+    """
+    Create the test schema straight from the models (like syncdb) instead of replaying every migration.
+    """
+
+    def __contains__(self, item):
+        return True
+
+    def __getitem__(self, item):
+        return None
+
+
+MIGRATION_MODULES = DisableMigrations()